@@ -11,6 +11,7 @@ from typing import Optional
 # from app.core.database import get_db  # Not used - Supabase only
 from app.core.security import decode_token
 from app.core.config import settings
+from app.core.data_access import canonical_model_id
 from app.models.user import User, UserRole
 
 logger = structlog.get_logger()
@@ -143,3 +144,19 @@ async def get_current_admin(
         )
     
     return current_user
+
+
+async def get_model_id(model_id: str) -> str:
+    """
+    Resolve a ``{model_id}`` path parameter to its canonical form.
+    
+    Strips the legacy ``_metrics`` suffix once per request, so the data
+    access layer only ever sees canonical IDs.
+    
+    Args:
+        model_id: Model identifier from the path (with or without _metrics suffix)
+        
+    Returns:
+        Canonical model identifier
+    """
+    return canonical_model_id(model_id)
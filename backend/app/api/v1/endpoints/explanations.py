@@ -3,11 +3,12 @@ XAI explanation generation endpoints.
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 from pydantic import BaseModel, ConfigDict
 import structlog
 
-from app.api.dependencies import get_current_researcher
+from app.api.dependencies import get_current_researcher, get_model_id
+from app.core.data_access import canonical_model_id
 from app.services.explanation_service import explanation_service
 from app.services.quality_metrics_service import quality_metrics_service
 from app.utils.supabase_client import supabase_db
@@ -24,6 +25,8 @@ class ExplanationRequest(BaseModel):
     model_id: str
     method: str = "shap"  # 'shap' or 'lime'
     sample_size: int = 100
+    num_samples: Optional[int] = None  # LIME perturbations per instance (server default if unset)
+    level: Literal['fast', 'full'] = 'full'  # 'fast': tree models' built-in importances, no SHAP pass
 
 
 class LocalExplanationRequest(BaseModel):
@@ -35,6 +38,15 @@ class LocalExplanationRequest(BaseModel):
     method: str = "shap"
 
 
+class LocalExplanationBatchRequest(BaseModel):
+    """Request schema for several local explanations computed together."""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    model_id: str
+    sample_indices: List[int]  # Indices of the samples in test set
+    method: str = "shap"
+
+
 @router.post("/generate")
 async def create_explanation(
     request: ExplanationRequest,
@@ -60,8 +72,10 @@ async def create_explanation(
                 detail=f"Unsupported method: {request.method}. Use 'shap' or 'lime'."
             )
         
+        model_id = canonical_model_id(request.model_id)
+        
         # Validate model exists
-        model = supabase_db.get_model(request.model_id)
+        model = supabase_db.get_model(model_id)
         if not model:
             raise HTTPException(
                 status_code=404,
@@ -71,18 +85,20 @@ async def create_explanation(
         # Start explanation generation in background
         background_tasks.add_task(
             explanation_service.generate_explanation,
-            request.model_id,
+            model_id,
             request.method.lower(),
-            request.sample_size
+            request.sample_size,
+            request.num_samples,
+            request.level
         )
         
         logger.info("Explanation generation queued",
-                   model_id=request.model_id,
+                   model_id=model_id,
                    method=request.method)
         
         return {
             "message": "Explanation generation started",
-            "model_id": request.model_id,
+            "model_id": model_id,
             "method": request.method,
             "status": "processing",
             "note": "Check status with GET /explanations/model/{model_id}"
@@ -128,7 +144,7 @@ async def get_explanation(
 
 @router.get("/model/{model_id}")
 async def get_model_explanations(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """Get all explanations for a model."""
@@ -145,7 +161,7 @@ async def get_model_explanations(
 
 @router.get("/model/{model_id}/global")
 async def get_global_explanations(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """
@@ -183,7 +199,7 @@ async def get_global_explanations(
 
 @router.get("/compare/{model_id}")
 async def compare_explanations(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """Compare SHAP and LIME explanations for a model."""
@@ -256,7 +272,7 @@ async def generate_local_explanation(
             result = await asyncio.wait_for(
                 asyncio.to_thread(
                     explanation_service.generate_local_explanation,
-                    request.model_id,
+                    canonical_model_id(request.model_id),
                     request.sample_index,
                     request.method
                 ),
@@ -290,6 +306,71 @@ async def generate_local_explanation(
         )
 
 
+@router.post("/local/batch")
+async def generate_local_explanations_batch(
+    request: LocalExplanationBatchRequest,
+    current_user: str = Depends(get_current_researcher)
+):
+    """
+    Generate local SHAP explanations for several samples in one pass.
+    
+    The model and test data are loaded once and SHAP values for all samples
+    come from a single batched explainer call, which is much faster than
+    requesting each force plot separately.
+    
+    Args:
+        request: Batch request with model_id and sample_indices
+        current_user: Authenticated user
+        
+    Returns:
+        Local SHAP explanations, one per requested sample
+    """
+    if not request.sample_indices:
+        raise HTTPException(status_code=400, detail="sample_indices must not be empty")
+    
+    try:
+        import asyncio
+        
+        logger.info("Generating local explanations",
+                   model_id=request.model_id,
+                   count=len(request.sample_indices))
+        
+        try:
+            results = await asyncio.wait_for(
+                asyncio.to_thread(
+                    explanation_service.generate_local_explanations_batch,
+                    canonical_model_id(request.model_id),
+                    request.sample_indices,
+                    request.method
+                ),
+                timeout=60.0
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail="Explanation generation timed out. Try fewer samples."
+            )
+        
+        return {
+            "status": "success",
+            "model_id": request.model_id,
+            "method": request.method,
+            "explanations": results
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to generate local explanations",
+                    model_id=request.model_id,
+                    sample_indices=request.sample_indices,
+                    error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate local explanations: {str(e)}"
+        )
+
+
 @router.post("/{explanation_id}/evaluate-quality")
 async def evaluate_explanation_quality(
     explanation_id: str,
@@ -97,7 +97,7 @@ async def preprocess_home_credit_dataset():
     - Check if files exist, download if not
     - Handle missing values
     - Encode categorical variables
-    - Scale features
+    - Scale features (only when requested; tree models do not need it)
     - Train/val/test split
     - Generate EDA statistics
     """
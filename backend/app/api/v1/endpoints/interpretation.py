@@ -5,14 +5,16 @@ Provides both LLM-driven and rule-based interpretation of SHAP values.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional, Literal
 from pydantic import BaseModel, ConfigDict
+import json
 import structlog
 
-from app.api.dependencies import get_current_researcher
+from app.api.dependencies import get_current_researcher, get_model_id
 from app.services.interpretation_service import interpretation_service
-from app.utils.supabase_client import supabase_db
-from app.core.data_access import dal
+from app.utils.supabase_client import supabase_db, MODEL_SUMMARY_FIELDS
+from app.core.data_access import dal, canonical_model_id
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -71,17 +73,17 @@ async def generate_interpretation(
     """
     try:
         # Strip _metrics suffix if present
-        base_model_id = request.model_id.replace('_metrics', '')
+        base_model_id = canonical_model_id(request.model_id)
         
         # Get model context via DAL
-        model = dal.get_model(base_model_id, include_metrics=False)
+        model = dal.get_model_record(base_model_id, include_metrics=False, fields=MODEL_SUMMARY_FIELDS)
         if not model:
             raise HTTPException(status_code=404, detail=f"Model {request.model_id} not found")
         
         model_context = {
-            "model_type": model.get("model_type"),
-            "dataset_id": model.get("dataset_id"),
-            "name": model.get("name")
+            "model_type": model.model_type,
+            "dataset_id": model.dataset_id,
+            "name": model.name
         }
         
         # Generate interpretation
@@ -111,6 +113,56 @@ async def generate_interpretation(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/stream")
+async def stream_interpretation(
+    request: InterpretationRequest,
+    current_user: str = Depends(get_current_researcher)
+):
+    """
+    Stream an LLM interpretation as server-sent events.
+    
+    Each ``data:`` event carries a JSON-encoded text fragment as GPT-4
+    generates it; a final ``done`` event closes the stream. The request's
+    mode is ignored (streaming is LLM only).
+    
+    Args:
+        request: Interpretation request with model_id and SHAP data
+        current_user: Authenticated user
+        
+    Returns:
+        text/event-stream response
+    """
+    base_model_id = canonical_model_id(request.model_id)
+    model = dal.get_model_record(base_model_id, include_metrics=False, fields=MODEL_SUMMARY_FIELDS)
+    if not model:
+        raise HTTPException(status_code=404, detail=f"Model {request.model_id} not found")
+    
+    # Fail before the stream starts; errors after the headers are sent can
+    # only end the stream
+    if not interpretation_service.openai_client:
+        raise HTTPException(status_code=400, detail="OpenAI API key not configured")
+    
+    logger.info("Streaming interpretation", model_id=request.model_id)
+    
+    def events():
+        try:
+            for fragment in interpretation_service.generate_interpretation_stream(request.shap_data):
+                yield f"data: {json.dumps(fragment)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            logger.error("Interpretation stream failed",
+                        model_id=request.model_id,
+                        error=str(e))
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Reverse proxies (nginx) must not buffer the stream either
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/local")
 async def generate_local_interpretation(
     request: LocalInterpretationRequest,
@@ -133,17 +185,17 @@ async def generate_local_interpretation(
     """
     try:
         # Strip _metrics suffix if present
-        base_model_id = request.model_id.replace('_metrics', '')
+        base_model_id = canonical_model_id(request.model_id)
         
         # Get model context via DAL
-        model = dal.get_model(base_model_id, include_metrics=False)
+        model = dal.get_model_record(base_model_id, include_metrics=False, fields=MODEL_SUMMARY_FIELDS)
         if not model:
             raise HTTPException(status_code=404, detail=f"Model {request.model_id} not found")
         
         model_context = {
-            "model_type": model.get("model_type"),
-            "dataset_id": model.get("dataset_id"),
-            "name": model.get("name")
+            "model_type": model.model_type,
+            "dataset_id": model.dataset_id,
+            "name": model.name
         }
         
         logger.info("Generating local interpretation",
@@ -201,15 +253,15 @@ async def generate_local_interpretation(
 
 @router.post("/compare")
 async def compare_interpretations(
-    model_id: str,
     shap_data: Dict[str, Any],
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """
     Generate both LLM and rule-based interpretations for comparison.
     
     Args:
-        model_id: Model identifier (with or without _metrics suffix)
+        model_id: Canonical model identifier (see get_model_id)
         shap_data: SHAP explanation data
         current_user: Authenticated user
         
@@ -217,18 +269,15 @@ async def compare_interpretations(
         Both interpretations side-by-side
     """
     try:
-        # Strip _metrics suffix if present
-        base_model_id = model_id.replace('_metrics', '')
-        
         # Get model context via DAL
-        model = dal.get_model(base_model_id, include_metrics=False)
+        model = dal.get_model_record(model_id, include_metrics=False, fields=MODEL_SUMMARY_FIELDS)
         if not model:
             raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
         
         model_context = {
-            "model_type": model.get("model_type"),
-            "dataset_id": model.get("dataset_id"),
-            "name": model.get("name")
+            "model_type": model.model_type,
+            "dataset_id": model.dataset_id,
+            "name": model.name
         }
         
         logger.info("Generating both interpretations for comparison", model_id=model_id)
@@ -305,34 +354,31 @@ async def submit_feedback(
 
 @router.get("/model/{model_id}/shap")
 async def get_model_shap_data(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """
     Get SHAP explanation data for a model.
     
     Args:
-        model_id: Model identifier (with or without _metrics suffix)
+        model_id: Canonical model identifier (see get_model_id)
         current_user: Authenticated user
         
     Returns:
         SHAP explanation data
     """
     try:
-        # Strip _metrics suffix if present (models table has it, explanations don't)
-        base_model_id = model_id.replace('_metrics', '')
-        
-        logger.info("Fetching SHAP data", model_id=model_id, base_model_id=base_model_id)
+        logger.info("Fetching SHAP data", model_id=model_id)
         
         # Get SHAP explanation via DAL
         # First try to get with status filter
-        shap_explanation = dal.get_explanation(base_model_id, method='shap', status='completed')
+        shap_explanation = dal.get_explanation(model_id, method='shap', status='completed')
         logger.info("First attempt result", has_shap=bool(shap_explanation))
         
         # If not found, try without status filter (for backwards compatibility)
         if not shap_explanation:
-            logger.info("No completed SHAP found, trying without status filter", model_id=base_model_id)
-            all_explanations = supabase_db.list_explanations(model_id=base_model_id)
+            logger.info("No completed SHAP found, trying without status filter", model_id=model_id)
+            all_explanations = supabase_db.list_explanations(model_id=model_id)
             logger.info("All explanations found", count=len(all_explanations), 
                        methods=[e.get('method') for e in all_explanations])
             shap_explanation = next(
@@ -343,20 +389,18 @@ async def get_model_shap_data(
         
         if not shap_explanation:
             # Provide helpful error message
-            logger.warning("No SHAP explanation found", 
-                          model_id=model_id, 
-                          base_model_id=base_model_id)
+            logger.warning("No SHAP explanation found", model_id=model_id)
             
             raise HTTPException(
                 status_code=404,
                 detail={
                     "error": "No SHAP explanation found for this model",
-                    "model_id": base_model_id,
+                    "model_id": model_id,
                     "help": "This model doesn't have a SHAP explanation yet. Please train a new model (SHAP is auto-generated) or select a different model."
                 }
             )
         
-        logger.info("SHAP explanation found", model_id=base_model_id)
+        logger.info("SHAP explanation found", model_id=model_id)
         return shap_explanation
         
     except HTTPException:
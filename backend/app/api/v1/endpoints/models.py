@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from pydantic import BaseModel, ConfigDict
 import structlog
 
-from app.api.dependencies import get_current_researcher
+from app.api.dependencies import get_current_researcher, get_model_id
 from app.services.model_service import model_service
 from app.services.dataset_service import dataset_service
 from app.utils.supabase_client import supabase_db
@@ -49,7 +49,7 @@ async def list_models(
 
 @router.get("/{model_id}")
 async def get_model(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """Get detailed information about a specific model with metrics."""
@@ -202,7 +202,7 @@ async def train_model(
 
 @router.delete("/{model_id}")
 async def delete_model(
-    model_id: str,
+    model_id: str = Depends(get_model_id),
     current_user: str = Depends(get_current_researcher)
 ):
     """
@@ -215,45 +215,42 @@ async def delete_model(
     - Model file from R2 storage
     """
     try:
-        # Strip _metrics suffix if present
-        base_model_id = model_id.replace('_metrics', '')
-        
         # Check if model exists
-        model = supabase_db.get_model(base_model_id)
+        model = supabase_db.get_model(model_id)
         if not model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Model {model_id} not found"
             )
         
-        logger.info("Deleting model", model_id=base_model_id, user=current_user)
+        logger.info("Deleting model", model_id=model_id, user=current_user)
         
         # Delete explanations first
         try:
-            explanations = supabase_db.list_explanations(model_id=base_model_id)
+            explanations = supabase_db.list_explanations(model_id=model_id)
             for exp in explanations:
                 supabase_db.client.table('explanations').delete().eq('id', exp['id']).execute()
-            logger.info("Deleted explanations", model_id=base_model_id, count=len(explanations))
+            logger.info("Deleted explanations", model_id=model_id, count=len(explanations))
         except Exception as e:
             logger.warning("Failed to delete explanations", error=str(e))
         
         # Delete metrics
         try:
-            supabase_db.client.table('model_metrics').delete().eq('model_id', base_model_id).execute()
-            logger.info("Deleted metrics", model_id=base_model_id)
+            supabase_db.client.table('model_metrics').delete().eq('model_id', model_id).execute()
+            logger.info("Deleted metrics", model_id=model_id)
         except Exception as e:
             logger.warning("Failed to delete metrics", error=str(e))
         
         # Delete model metadata
-        supabase_db.client.table('models').delete().eq('id', base_model_id).execute()
-        logger.info("Deleted model metadata", model_id=base_model_id)
+        supabase_db.client.table('models').delete().eq('id', model_id).execute()
+        logger.info("Deleted model metadata", model_id=model_id)
         
         # TODO: Delete model file from R2 storage if needed
         # This would require the R2 client and model file path
         
         return {
             "message": "Model deleted successfully",
-            "model_id": base_model_id,
+            "model_id": model_id,
             "deleted_items": ["model", "metrics", "explanations"]
         }
     
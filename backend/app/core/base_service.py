@@ -12,7 +12,7 @@ All XAI platform services inherit from this base class to ensure:
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
 import structlog
-from app.core.data_access import dal
+from app.core.data_access import dal, canonical_model_id
 from app.core.config import settings
 
 logger = structlog.get_logger()
@@ -117,11 +117,13 @@ class ModelServiceBase(XAIService):
     
     def get_model(self, model_id: str, include_metrics: bool = True) -> Optional[Dict[str, Any]]:
         """Get model through DAL."""
-        return self.dal.get_model(model_id, include_metrics=include_metrics)
+        return self.dal.get_model(canonical_model_id(model_id), include_metrics=include_metrics)
     
     def save_metrics(self, model_id: str, metrics: Dict[str, Any]) -> bool:
         """Save model metrics through DAL."""
-        return self.dal.save_model_metrics(model_id, metrics, source_module=self.service_name)
+        return self.dal.save_model_metrics(
+            canonical_model_id(model_id), metrics, source_module=self.service_name
+        )
 
 
 class DatasetServiceBase(XAIService):
@@ -164,7 +166,7 @@ class ExplanationServiceBase(XAIService):
         method: str = 'shap'
     ) -> Optional[Dict[str, Any]]:
         """Get explanation through DAL."""
-        return self.dal.get_explanation(model_id, method=method)
+        return self.dal.get_explanation(canonical_model_id(model_id), method=method)
     
     def save_explanation(
         self,
@@ -174,7 +176,7 @@ class ExplanationServiceBase(XAIService):
     ) -> Optional[str]:
         """Save explanation through DAL."""
         return self.dal.save_explanation(
-            model_id,
+            canonical_model_id(model_id),
             method,
             explanation_data,
             source_module=self.service_name
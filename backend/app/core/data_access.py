@@ -12,14 +12,49 @@ Prevents regressions by providing a single source of truth for:
 All endpoints should import from this layer instead of handling data separately.
 """
 
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Union, Iterable
+from datetime import datetime, timezone
 import structlog
 from app.utils.supabase_client import supabase_db
 from app.core.config import settings
+from app.core.records import ModelRecord, MetricsRecord, ExplanationRecord
 
 logger = structlog.get_logger(__name__)
 
+_METRICS_SUFFIX = '_metrics'
+
+
+def canonical_model_id(model_id: str) -> str:
+    """
+    Strip the legacy ``_metrics`` suffix from a model ID.
+    
+    Returns the same string object when the suffix is absent, so callers
+    that already pass clean IDs pay no allocation.
+    """
+    if model_id.endswith(_METRICS_SUFFIX):
+        return model_id[:-len(_METRICS_SUFFIX)]
+    return model_id
+
+
+def _check_canonical(model_id: str) -> None:
+    """
+    Development guard for DAL entry points.
+    
+    Model IDs are normalized once at the route layer (see
+    ``app.api.dependencies.get_model_id``); the DAL no longer strips the
+    suffix itself.
+    """
+    if settings.DEBUG:
+        assert not model_id.endswith(_METRICS_SUFFIX), (
+            f"Non-canonical model_id {model_id!r} reached the DAL; "
+            "normalize it with canonical_model_id at the route layer"
+        )
+
+
+# Canonical explanation key (unique constraint uq_expl_canonical, migration 9):
+# saving an explanation upserts on it, so re-running one replaces the row
+EXPLANATION_CONFLICT_KEY = 'model_id,method,is_global,instance_id'
+
 
 class DataAccessLayer:
     """
@@ -45,9 +80,25 @@ class DataAccessLayer:
         else:
             logger.info("DAL initialized successfully")
     
-    def _add_metadata(self, data: Dict[str, Any], source_module: str) -> Dict[str, Any]:
-        """Add standard metadata fields to any data object."""
-        data['last_updated'] = datetime.utcnow().isoformat()
+    @staticmethod
+    def _utc_timestamp() -> str:
+        """Current UTC time as an ISO-8601 string (millisecond precision)."""
+        return datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+    
+    def _add_metadata(
+        self,
+        data: Dict[str, Any],
+        source_module: str,
+        *,
+        now: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Add standard metadata fields to any data object.
+        
+        Callers writing many records in one operation should compute
+        ``now = self._utc_timestamp()`` once and pass it in.
+        """
+        data['last_updated'] = now or self._utc_timestamp()
         data['source_module'] = source_module
         return data
     
@@ -55,44 +106,52 @@ class DataAccessLayer:
     # MODEL OPERATIONS
     # ==========================================
     
-    def get_model(self, model_id: str, include_metrics: bool = True) -> Optional[Dict[str, Any]]:
+    def get_model(
+        self,
+        model_id: str,
+        include_metrics: bool = True,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get model by ID with optional metrics enrichment.
         
         Args:
-            model_id: Model identifier (with or without _metrics suffix)
+            model_id: Canonical model identifier
             include_metrics: Whether to include metrics in response
+            fields: Model columns to fetch (defaults to all columns)
             
         Returns:
             Model data with metrics if requested, None if not found
         """
-        # Strip _metrics suffix if present
-        base_model_id = model_id.replace('_metrics', '')
+        _check_canonical(model_id)
         
         try:
-            model = self.db.get_model(base_model_id)
+            model = self.db.get_model(model_id, fields=fields)
             
             if not model:
-                logger.warning("Model not found", model_id=base_model_id)
+                logger.warning("Model not found", model_id=model_id)
                 return None
             
             if include_metrics:
-                metrics = self.get_model_metrics(base_model_id)
+                metrics = self.get_model_metrics(model_id)
                 if metrics:
-                    model = {**model, **metrics}
+                    model.update(metrics)
             
-            logger.debug("Model retrieved", model_id=base_model_id, has_metrics=include_metrics)
+            logger.debug("Model retrieved", model_id=model_id, has_metrics=include_metrics)
             return model
             
         except Exception as e:
-            logger.error("Failed to get model", model_id=base_model_id, error=str(e))
+            logger.error("Failed to get model", model_id=model_id, error=str(e))
             return None
     
     def list_models(
         self, 
         dataset_id: Optional[str] = None,
         include_metrics: bool = True,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         List all models with optional filtering.
@@ -101,27 +160,33 @@ class DataAccessLayer:
             dataset_id: Filter by dataset
             include_metrics: Include metrics in each model
             status: Filter by status (training, completed, failed)
+            fields: Model columns to fetch (defaults to all columns)
+            offset: Index of the first model to return (used with limit)
+            limit: Maximum number of models to return (None for all)
             
         Returns:
             List of models with optional metrics
         """
         try:
-            models = self.db.list_models(dataset_id=dataset_id)
+            models = self.db.list_models(
+                dataset_id=dataset_id,
+                fields=fields,
+                offset=offset,
+                limit=limit
+            )
             
             # Filter by status if provided
             if status:
                 models = [m for m in models if m.get('status') == status]
             
             # Enrich with metrics if requested
+            # (rows are freshly fetched and not shared, so merge in place;
+            # legacy rows store the id with the _metrics suffix)
             if include_metrics:
-                enriched_models = []
                 for model in models:
-                    metrics = self.get_model_metrics(model['id'])
+                    metrics = self.get_model_metrics(canonical_model_id(model['id']))
                     if metrics:
-                        enriched_models.append({**model, **metrics})
-                    else:
-                        enriched_models.append(model)
-                models = enriched_models
+                        model.update(metrics)
             
             logger.debug("Models listed", count=len(models), dataset_id=dataset_id)
             return models
@@ -130,6 +195,38 @@ class DataAccessLayer:
             logger.error("Failed to list models", error=str(e))
             return []
     
+    def get_model_record(
+        self,
+        model_id: str,
+        include_metrics: bool = True,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[ModelRecord]:
+        """
+        Typed variant of get_model.
+        
+        Returns:
+            ModelRecord (with metrics attached if requested), None if not found
+        """
+        _check_canonical(model_id)
+        
+        try:
+            row = self.db.get_model(model_id, fields=fields)
+            if not row:
+                logger.warning("Model not found", model_id=model_id)
+                return None
+            
+            record = ModelRecord.from_row(row)
+            if include_metrics:
+                metrics = self.get_model_metrics(model_id)
+                if metrics:
+                    record = record.merge(MetricsRecord.from_row(metrics))
+            
+            return record
+            
+        except Exception as e:
+            logger.error("Failed to get model record", model_id=model_id, error=str(e))
+            return None
+    
     def create_model(self, model_data: Dict[str, Any], source_module: str = "model_service") -> Optional[str]:
         """
         Create a new model entry.
@@ -195,12 +292,13 @@ class DataAccessLayer:
         Returns:
             True if successful
         """
+        _check_canonical(model_id)
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
             updates = self._add_metadata(updates, source_module)
             
-            self.db.client.table('models').update(updates).eq('id', base_model_id).execute()
-            logger.info("Model updated", model_id=base_model_id, source=source_module)
+            self.db.client.table('models').update(updates).eq('id', model_id).execute()
+            logger.info("Model updated", model_id=model_id, source=source_module)
             return True
             
         except Exception as e:
@@ -218,19 +316,19 @@ class DataAccessLayer:
         Returns:
             True if successful
         """
+        _check_canonical(model_id)
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
-            
             # Delete explanations
-            self.db.client.table('explanations').delete().eq('model_id', base_model_id).execute()
+            self.db.client.table('explanations').delete().eq('model_id', model_id).execute()
             
             # Delete metrics
-            self.db.client.table('model_metrics').delete().eq('model_id', base_model_id).execute()
+            self.db.client.table('model_metrics').delete().eq('model_id', model_id).execute()
             
             # Delete model
-            self.db.client.table('models').delete().eq('id', base_model_id).execute()
+            self.db.client.table('models').delete().eq('id', model_id).execute()
             
-            logger.info("Model deleted", model_id=base_model_id, source=source_module)
+            logger.info("Model deleted", model_id=model_id, source=source_module)
             return True
             
         except Exception as e:
@@ -251,12 +349,13 @@ class DataAccessLayer:
         Returns:
             Metrics dictionary or None
         """
+        _check_canonical(model_id)
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
-            metrics = self.db.get_model_metrics(base_model_id)
+            metrics = self.db.get_model_metrics(model_id)
             
             if metrics:
-                logger.debug("Metrics retrieved", model_id=base_model_id)
+                logger.debug("Metrics retrieved", model_id=model_id)
             
             return metrics
             
@@ -281,13 +380,13 @@ class DataAccessLayer:
         Returns:
             True if successful
         """
+        _check_canonical(model_id)
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
-            
             # Map metrics to table columns
             metrics_data = {
-                'id': base_model_id,  # Primary key
-                'model_id': base_model_id,
+                'id': model_id,  # Primary key
+                'model_id': model_id,
                 'auc_roc': metrics.get('auc_roc'),
                 'auc_pr': metrics.get('auc_pr'),
                 'f1_score': metrics.get('f1_score'),
@@ -303,13 +402,13 @@ class DataAccessLayer:
                 'pr_curve': metrics.get('pr_curve'),  # JSONB
                 'class_metrics': metrics.get('class_metrics'),  # JSONB
                 'additional_metrics': metrics.get('additional_metrics'),  # JSONB
-                **self._add_metadata({}, source_module)
             }
+            self._add_metadata(metrics_data, source_module)
             
             # Upsert metrics
             result = self.db.client.table('model_metrics').upsert(metrics_data).execute()
             
-            logger.info("Metrics saved", model_id=base_model_id, source=source_module)
+            logger.info("Metrics saved", model_id=model_id, source=source_module)
             return True
             
         except Exception as e:
@@ -349,11 +448,10 @@ class DataAccessLayer:
     ) -> bool:
         """Update dataset processing status."""
         try:
-            updates = {
-                'status': status,
-                'processed': processed,
-                **self._add_metadata({}, source_module)
-            }
+            updates = self._add_metadata(
+                {'status': status, 'processed': processed},
+                source_module
+            )
             
             self.db.client.table('datasets').update(updates).eq('id', dataset_id).execute()
             logger.info("Dataset status updated", dataset_id=dataset_id, status=status)
@@ -384,9 +482,10 @@ class DataAccessLayer:
         Returns:
             Explanation data or None
         """
+        _check_canonical(model_id)
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
-            explanations = self.db.list_explanations(model_id=base_model_id)
+            explanations = self.db.list_explanations(model_id=model_id)
             
             # Find matching explanation
             explanation = next(
@@ -396,7 +495,7 @@ class DataAccessLayer:
             )
             
             if explanation:
-                logger.debug("Explanation retrieved", model_id=base_model_id, method=method)
+                logger.debug("Explanation retrieved", model_id=model_id, method=method)
             
             return explanation
             
@@ -404,43 +503,65 @@ class DataAccessLayer:
             logger.error("Failed to get explanation", model_id=model_id, error=str(e))
             return None
     
+    def get_explanation_record(
+        self,
+        model_id: str,
+        method: str = 'shap',
+        status: str = 'completed'
+    ) -> Optional[ExplanationRecord]:
+        """Typed variant of get_explanation."""
+        explanation = self.get_explanation(model_id, method=method, status=status)
+        return ExplanationRecord.from_row(explanation) if explanation else None
+    
     def save_explanation(
         self,
         model_id: str,
         method: str,
         explanation_data: Dict[str, Any],
         source_module: str = "explanation_service",
-        explanation_type: str = "global"
+        explanation_type: str = "global",
+        keep_existing: bool = False
     ) -> Optional[str]:
         """
-        Save explanation data.
+        Save explanation data, replacing the model's existing explanation
+        with the same method and scope (upsert on the canonical key).
         
         Args:
             model_id: Model identifier
             method: Explanation method
-            explanation_data: Explanation data
+            explanation_data: Explanation data (must set 'instance_id' for
+                              local explanations)
             source_module: Module saving explanation
             explanation_type: Type of explanation ('global' or 'local')
+            keep_existing: Leave an existing row untouched instead of
+                           updating it (ON CONFLICT DO NOTHING)
             
         Returns:
-            Explanation ID if successful
+            Explanation ID if a row was written
+            
+        Raises:
+            ValueError: If a local explanation has no instance_id (with the
+                NULLS NOT DISTINCT key it would replace the model's other
+                local explanations for this method)
         """
+        _check_canonical(model_id)
+        if explanation_type == 'local' and explanation_data.get('instance_id') is None:
+            raise ValueError("Local explanations require an instance_id")
+        
         try:
-            base_model_id = model_id.replace('_metrics', '')
-            
-            data = {
-                'model_id': base_model_id,
-                'method': method,
-                'explanation_type': explanation_type,
-                **explanation_data,
-                **self._add_metadata({}, source_module)
-            }
+            data = self._build_explanation_row(
+                model_id, method, explanation_data, explanation_type, source_module
+            )
             
-            result = self.db.client.table('explanations').insert(data).execute()
+            result = self.db.client.table('explanations').upsert(
+                data,
+                on_conflict=EXPLANATION_CONFLICT_KEY,
+                ignore_duplicates=keep_existing
+            ).execute()
             
             if result.data:
                 exp_id = result.data[0]['id']
-                logger.info("Explanation saved", model_id=base_model_id, method=method)
+                logger.info("Explanation saved", model_id=model_id, method=method)
                 return exp_id
             
             return None
@@ -449,6 +570,25 @@ class DataAccessLayer:
             logger.error("Failed to save explanation", model_id=model_id, error=str(e))
             return None
     
+    def _build_explanation_row(
+        self,
+        model_id: str,
+        method: str,
+        explanation_data: Dict[str, Any],
+        explanation_type: str,
+        source_module: str
+    ) -> Dict[str, Any]:
+        """Assemble an explanations table row with standard metadata."""
+        data = {
+            'model_id': model_id,
+            'method': method,
+            'explanation_type': explanation_type,
+            'is_global': explanation_type == 'global',
+            'instance_id': None,
+        }
+        data.update(explanation_data)
+        return self._add_metadata(data, source_module)
+    
     # ==========================================
     # INTERPRETATION FEEDBACK OPERATIONS
     # ==========================================
@@ -460,10 +600,7 @@ class DataAccessLayer:
     ) -> bool:
         """Save interpretation feedback for research."""
         try:
-            data = {
-                **feedback_data,
-                **self._add_metadata({}, source_module)
-            }
+            data = self._add_metadata(dict(feedback_data), source_module)
             
             self.db.client.table('interpretation_feedback').insert(data).execute()
             logger.info("Interpretation feedback saved", mode=feedback_data.get('mode'))
@@ -474,7 +611,20 @@ class DataAccessLayer:
             return False
     
     def get_interpretation_stats(self) -> Dict[str, Any]:
-        """Get aggregated interpretation feedback statistics."""
+        """
+        Get aggregated interpretation feedback statistics.
+        
+        Uses the get_interpretation_stats() RPC (migration 6) so the total is
+        computed in Postgres; falls back to summing the summary view rows if
+        the function has not been deployed yet.
+        """
+        try:
+            result = self.db.client.rpc('get_interpretation_stats').execute()
+            if result.data:
+                return result.data
+        except Exception as e:
+            logger.debug("get_interpretation_stats RPC unavailable, using summary view", error=str(e))
+        
         try:
             result = self.db.client.table('interpretation_feedback_summary').select('*').execute()
             
@@ -4,9 +4,12 @@ NOTE: This platform uses Supabase as the primary database.
 SQLAlchemy is kept for potential future use but not actively used.
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Type
+
+from sqlalchemy import CheckConstraint
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
 import structlog
 
 from app.core.config import settings
@@ -24,25 +27,85 @@ Base = declarative_base()
 logger.info("Database module loaded (using Supabase for all operations)")
 
 
-async def get_db() -> AsyncSession:
+def enum_check(column: str, enum_cls: Type[Enum], name: str) -> CheckConstraint:
+    """
+    CHECK constraint limiting a short string column to an enum's values.
+    
+    Used instead of native Postgres enum types: a String(16) column with a
+    CHECK keeps status indexes small and needs no ALTER TYPE migrations.
+    
+    Args:
+        column: Column name
+        enum_cls: Enum whose values are allowed
+        name: Constraint name
+        
+    Returns:
+        CheckConstraint for ``__table_args__``
+    """
+    allowed = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({allowed})", name=name)
+
+
+def utc_now() -> datetime:
+    """
+    Client-side ``created_at`` default (timezone-aware UTC).
+    
+    Lets inserts carry the timestamp instead of relying on a server default,
+    which SQLAlchemy would have to fetch back after each insert.
+    """
+    return datetime.now(timezone.utc)
+
+
+async def get_db():
     """
     Dependency for getting async database sessions.
-    NOTE: Not used - all database operations go through Supabase DAL.
+    NOTE: Only available with USE_SQLALCHEMY; by default all database
+    operations go through the Supabase DAL. Sessions check out a connection
+    from the engine's asyncpg-backed pool created in ``init_db`` and return
+    it when the request finishes.
     
     Yields:
-        AsyncSession: Database session
+        AsyncSession bound to the pooled engine
+        
+    Raises:
+        RuntimeError: If SQLAlchemy is not enabled (USE_SQLALCHEMY)
     """
-    raise RuntimeError("SQLAlchemy sessions not available. Use Supabase DAL instead.")
+    if AsyncSessionLocal is None:
+        raise RuntimeError("SQLAlchemy sessions not available. Use Supabase DAL instead.")
+    
+    async with AsyncSessionLocal() as session:
+        yield session
 
 
 async def init_db():
     """
     Initialize database tables.
     NOTE: Not used - Supabase schema is managed via SQL migrations.
+    Only when USE_SQLALCHEMY is enabled is the async engine created
+    (SQLAlchemy's asyncio extension is imported lazily here).
     """
-    logger.info("✅ Database initialization skipped (using Supabase)")
-    logger.info("   All tables managed via Supabase SQL migrations")
-    logger.info("   See: backend/migrations/FINAL_supabase_schema.sql")
+    global engine, AsyncSessionLocal
+    
+    if not settings.USE_SQLALCHEMY:
+        logger.info("✅ Database initialization skipped (using Supabase)")
+        logger.info("   All tables managed via Supabase SQL migrations")
+        logger.info("   See: backend/migrations/FINAL_supabase_schema.sql")
+        return
+    
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    
+    # One long-lived asyncpg connection pool for the process; connections are
+    # validated on checkout and every statement is bounded by a timeout
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        connect_args={"command_timeout": 60},
+    )
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    logger.info("SQLAlchemy engine created", database_url=settings.DATABASE_URL.split('@')[-1])
 
 
 async def close_db():
@@ -50,4 +113,13 @@ async def close_db():
     Close database connections.
     NOTE: Not used - Supabase connections managed by supabase-py client.
     """
-    logger.info("✅ Database cleanup skipped (using Supabase)")
+    global engine, AsyncSessionLocal
+    
+    if engine is None:
+        logger.info("✅ Database cleanup skipped (using Supabase)")
+        return
+    
+    await engine.dispose()
+    engine = None
+    AsyncSessionLocal = None
+    logger.info("SQLAlchemy engine disposed")
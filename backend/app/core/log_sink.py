@@ -0,0 +1,138 @@
+"""
+Queued Log Output
+=================
+
+structlog logger factory whose loggers only enqueue rendered log lines; a
+background thread drains the queue to stdout. Request handlers (and the
+event loop) never block on stdout I/O. While the writer thread is not
+running (before ``start()`` and after ``stop()``) lines are written
+synchronously, so nothing logged during import or shutdown is lost.
+"""
+
+import atexit
+import queue
+import sys
+import threading
+from typing import BinaryIO, Optional, Union
+
+_STOP = object()
+
+# Most lines drained from the queue into one write/flush
+MAX_BATCH_LINES = 256
+
+
+class QueuedLogger:
+    """structlog logger that hands rendered lines to a :class:`LogSink`."""
+
+    __slots__ = ("_sink",)
+
+    def __init__(self, sink: "LogSink"):
+        self._sink = sink
+
+    def msg(self, message: Union[bytes, str]) -> None:
+        """Emit one rendered log line (bytes from JSON, str from console)."""
+        self._sink.emit(message)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class LogSink:
+    """Background writer for log lines produced by :class:`QueuedLogger`."""
+
+    def __init__(self, stream: Optional[BinaryIO] = None):
+        """
+        Initialize the sink.
+
+        Args:
+            stream: Binary stream to write to (defaults to stdout's buffer)
+        """
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._stream = stream if stream is not None else sys.stdout.buffer
+        self._thread: Optional[threading.Thread] = None
+        # Serializes direct writes with the writer thread's final batch
+        self._write_lock = threading.Lock()
+        self._atexit_registered = False
+
+    def logger_factory(self, *args) -> QueuedLogger:
+        """structlog ``logger_factory``; logger names are ignored."""
+        return QueuedLogger(self)
+
+    def emit(self, line: Union[bytes, str]) -> None:
+        """Queue a line for the writer thread, or write it now if none is running."""
+        if self._thread is not None:
+            self._queue.put(line)
+        else:
+            self._write([line])
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self) -> None:
+        """Write out everything queued so far and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        # New lines are written directly from here on
+        self._thread = None
+        self._queue.put(_STOP)
+        thread.join()
+        # Lines enqueued by loggers that raced with the switch above
+        leftover = []
+        while True:
+            try:
+                line = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is not _STOP:
+                leftover.append(line)
+        if leftover:
+            self._write(leftover)
+
+    @staticmethod
+    def _encode(line: Union[bytes, str]) -> bytes:
+        if isinstance(line, str):
+            return line.encode("utf-8", "backslashreplace")
+        return line
+
+    def _run(self) -> None:
+        # Block for the first line, then drain whatever else is already
+        # queued and emit the batch with one write and one flush; under log
+        # bursts this collapses many syscalls into one, while an idle queue
+        # still gets each line out immediately
+        stopping = False
+        while not stopping:
+            batch = []
+            line = self._queue.get()
+            while True:
+                if line is _STOP:
+                    stopping = True
+                    break
+                batch.append(line)
+                if len(batch) >= MAX_BATCH_LINES:
+                    break
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        try:
+            with self._write_lock:
+                self._stream.write(b"\n".join(map(self._encode, batch)) + b"\n")
+                self._stream.flush()
+        except Exception:
+            # Never let a broken stdout take down the caller or writer thread
+            pass
+
+
+log_sink = LogSink()
@@ -0,0 +1,173 @@
+"""
+ASGI Middleware
+===============
+
+Pure ASGI middleware (no ``BaseHTTPMiddleware`` task hops) for the API.
+"""
+
+from typing import FrozenSet, List, Optional, Tuple
+
+import orjson
+import structlog
+from starlette.middleware.gzip import GZipMiddleware
+
+logger = structlog.get_logger()
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_PREFLIGHT_MAX_AGE = b"600"
+
+# The 500 response never varies, so it is serialized once
+_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+_ERROR_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_ERROR_BODY)).encode()),
+)
+
+
+class CORSAndErrorsMiddleware:
+    """CORS handling plus unhandled-exception-to-JSON in one ASGI layer.
+
+    Mirrors Starlette's ``CORSMiddleware`` configured with explicit origins,
+    ``allow_credentials=True`` and wildcard methods/headers/expose-headers:
+    preflights are answered directly, and allowed origins get the CORS
+    headers on every response. Unhandled exceptions become a 500 JSON
+    response that carries the same CORS headers, so browsers can read the
+    error instead of reporting a CORS failure.
+    """
+
+    def __init__(self, app, origins: FrozenSet[str]):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            origins: Allowed origins (exact match; ``"*"`` allows any)
+        """
+        self.app = app
+        self.origins = frozenset(origins)
+        self.allow_all = "*" in self.origins
+        # Response headers per allowed origin, keyed by the raw header bytes
+        # so a request is matched without decoding or building a list
+        self._origin_headers = {
+            origin.encode("latin-1"): self._cors_headers(origin.encode("latin-1"))
+            for origin in self.origins
+        }
+
+    def _headers_for(self, origin: Optional[bytes]) -> Optional[List[Tuple[bytes, bytes]]]:
+        """CORS response headers for ``origin``, or None if it is not allowed."""
+        if origin is None:
+            return None
+        headers = self._origin_headers.get(origin)
+        if headers is None and self.allow_all:
+            headers = self._cors_headers(origin)
+        return headers
+
+    @staticmethod
+    def _cors_headers(origin: bytes) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-expose-headers", b"*"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        cors_headers = self._headers_for(origin)
+
+        if (
+            origin is not None
+            and scope["method"] == "OPTIONS"
+            and any(name == b"access-control-request-method" for name, _ in scope["headers"])
+        ):
+            await self._preflight(send, origin if cors_headers is not None else None, request_headers)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if cors_headers is not None:
+                    message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error("Unhandled exception", exc_info=exc, path=scope.get("path"))
+            if response_started:
+                raise
+            headers = list(_ERROR_HEADERS)
+            if cors_headers is not None:
+                headers += cors_headers
+            await send({"type": "http.response.start", "status": 500, "headers": headers})
+            await send({"type": "http.response.body", "body": _ERROR_BODY})
+
+    @staticmethod
+    async def _preflight(send, origin, request_headers) -> None:
+        """Answer a CORS preflight (``origin`` is None when disallowed)."""
+        if origin is None:
+            body = b"Disallowed CORS origin"
+            status = 400
+            headers = []
+        else:
+            body = b"OK"
+            status = 200
+            headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-allow-methods", _ALLOW_METHODS),
+                (b"access-control-max-age", _PREFLIGHT_MAX_AGE),
+                (b"vary", b"Origin"),
+            ]
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+        headers += [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class SelectiveGZipMiddleware:
+    """``GZipMiddleware`` that passes selected paths through uncompressed.
+
+    Meant for streaming responses such as server-sent events: gzip buffers
+    small writes until its compressor flushes, so clients would see no
+    events until the stream ends. The pinned Starlette version compresses
+    ``text/event-stream`` like any other type, so those routes are skipped
+    by path.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, exclude_paths: FrozenSet[str] = frozenset()):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest body (bytes) that is compressed
+            exclude_paths: Request paths (exact match) never compressed
+        """
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
@@ -0,0 +1,124 @@
+"""
+Typed DAL Records
+=================
+
+Slotted, immutable record types for the hot DAL read paths (models,
+metrics, explanations). Fields mirror the Supabase schema in
+``migrations/FINAL_supabase_schema.sql``; unknown columns in a row are
+ignored so schema additions do not break reads.
+
+The dict-returning DAL methods remain the API used by the JSON response
+layer; use ``to_dict()`` to convert a record back.
+"""
+
+from dataclasses import dataclass, fields, asdict, replace
+from typing import Dict, Any, Optional, Type, TypeVar
+
+R = TypeVar("R", bound="_Record")
+
+
+class _Record:
+    """Shared row conversion helpers for DAL records."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls: Type[R], row: Dict[str, Any]) -> R:
+        """Build a record from a Supabase row, dropping unknown columns."""
+        return cls(**{f.name: row.get(f.name) for f in fields(cls) if f.name in row})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a plain dictionary."""
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class MetricsRecord(_Record):
+    """Row of the ``model_metrics`` table."""
+
+    model_id: str
+    auc_roc: Optional[float] = None
+    auc_pr: Optional[float] = None
+    f1_score: Optional[float] = None
+    precision: Optional[float] = None
+    recall: Optional[float] = None
+    accuracy: Optional[float] = None
+    log_loss: Optional[float] = None
+    brier_score: Optional[float] = None
+    expected_calibration_error: Optional[float] = None
+    maximum_calibration_error: Optional[float] = None
+    confusion_matrix: Optional[Any] = None
+    roc_curve: Optional[Any] = None
+    pr_curve: Optional[Any] = None
+    class_metrics: Optional[Any] = None
+    additional_metrics: Optional[Any] = None
+    created_at: Optional[str] = None
+    last_updated: Optional[str] = None
+    source_module: Optional[str] = None
+
+
+@dataclass(slots=True, frozen=True)
+class ModelRecord(_Record):
+    """Row of the ``models`` table, optionally carrying its metrics."""
+
+    id: str
+    name: Optional[str] = None
+    model_type: Optional[str] = None
+    version: Optional[str] = None
+    dataset_id: Optional[str] = None
+    status: Optional[str] = None
+    hyperparameters: Optional[Dict[str, Any]] = None
+    training_config: Optional[Dict[str, Any]] = None
+    feature_importance: Optional[Dict[str, Any]] = None
+    model_path: Optional[str] = None
+    model_hash: Optional[str] = None
+    model_size_mb: Optional[float] = None
+    training_time_seconds: Optional[float] = None
+    error_message: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    last_updated: Optional[str] = None
+    source_module: Optional[str] = None
+    metrics: Optional[MetricsRecord] = None
+
+    def merge(self, metrics: Optional[MetricsRecord]) -> "ModelRecord":
+        """Return a copy of this model with its metrics attached."""
+        if metrics is None:
+            return self
+        return replace(self, metrics=metrics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the flat dict shape returned by the DAL dict API
+        (metric columns merged into the model row).
+        """
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'metrics'}
+        if self.metrics is not None:
+            data.update(self.metrics.to_dict())
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class ExplanationRecord(_Record):
+    """Row of the ``explanations`` table."""
+
+    id: str
+    model_id: str
+    method: str
+    dataset_id: Optional[str] = None
+    explanation_type: Optional[str] = None
+    explanation_data: Optional[Dict[str, Any]] = None
+    summary_json: Optional[Dict[str, Any]] = None
+    top_features: Optional[Any] = None
+    feature_importance: Optional[Dict[str, Any]] = None
+    num_samples: Optional[int] = None
+    num_features: Optional[int] = None
+    generation_time_seconds: Optional[float] = None
+    status: Optional[str] = None
+    error_message: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    last_updated: Optional[str] = None
+    source_module: Optional[str] = None
@@ -1,9 +1,8 @@
 """Dataset loaders module."""
 
+import importlib
+
 from .base import BaseDatasetLoader
-from .ieee_cis import IEEECISLoader
-from .givemesomecredit import GiveMeSomeCreditLoader
-from .german_credit import GermanCreditLoader
 
 __all__ = [
     'BaseDatasetLoader',
@@ -13,6 +12,24 @@ __all__ = [
     'get_loader'
 ]
 
+# Loader modules are imported on first use so that only the dataset actually
+# requested pulls in its dependencies (e.g. the Kaggle client).
+_LOADERS = {
+    'ieee-cis-fraud': ('app.datasets.loaders.ieee_cis', 'IEEECISLoader'),
+    'givemesomecredit': ('app.datasets.loaders.givemesomecredit', 'GiveMeSomeCreditLoader'),
+    'german-credit': ('app.datasets.loaders.german_credit', 'GermanCreditLoader'),
+}
+
+_LOADER_CLASSES = {class_name: module for module, class_name in _LOADERS.values()}
+
+
+def __getattr__(name: str):
+    """Resolve loader classes lazily (PEP 562)."""
+    module = _LOADER_CLASSES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
 
 def get_loader(dataset_id: str, config: dict, data_dir=None) -> BaseDatasetLoader:
     """Get appropriate loader for dataset.
@@ -25,14 +42,10 @@ def get_loader(dataset_id: str, config: dict, data_dir=None) -> BaseDatasetLoade
     Returns:
         Dataset loader instance
     """
-    loaders = {
-        'ieee-cis-fraud': IEEECISLoader,
-        'givemesomecredit': GiveMeSomeCreditLoader,
-        'german-credit': GermanCreditLoader,
-    }
-    
-    loader_class = loaders.get(dataset_id)
-    if loader_class is None:
+    entry = _LOADERS.get(dataset_id)
+    if entry is None:
         raise ValueError(f"No loader found for dataset: {dataset_id}")
     
+    module, class_name = entry
+    loader_class = getattr(importlib.import_module(module), class_name)
     return loader_class(dataset_id, config, data_dir=data_dir)
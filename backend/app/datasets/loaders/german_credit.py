@@ -1,8 +1,10 @@
 """German Credit Risk dataset loader."""
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
-from .base import BaseDatasetLoader
+from .base import BaseDatasetLoader, fast_read_csv
+from app.utils.kaggle_client import get_kaggle_api
 import structlog
 
 logger = structlog.get_logger()
@@ -20,10 +22,7 @@ class GermanCreditLoader(BaseDatasetLoader):
         logger.info("Downloading German Credit dataset", dataset_id=self.dataset_id)
         
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Download dataset
             dataset_name = self.config.get('kaggle_dataset', 'uciml/german-credit')
@@ -64,38 +63,30 @@ class GermanCreditLoader(BaseDatasetLoader):
             logger.warning(f"Target column '{target_col}' not found in dataset. Creating synthetic target based on Credit amount.")
             # Create a simple binary target: high credit amount = risky (1), low = safe (0)
             median_credit = df['Credit amount'].median()
-            df[target_col] = (df['Credit amount'] > median_credit).astype(int)
+            df[target_col] = (df['Credit amount'] > median_credit).astype(np.int8)
             logger.info(f"Created synthetic target column: {target_col}")
         
         # Encode target variable (convert 'good'/'bad' to 0/1)
         elif df[target_col].dtype == 'object':
             logger.debug("Encoding target variable")
-            df[target_col] = (df[target_col] == positive_class).astype(int)
+            df[target_col] = (df[target_col] == positive_class).astype(np.int8)
         
         # Encode categorical variables
         logger.debug("Encoding categorical variables")
         categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-        
-        for col in categorical_cols:
-            if col != target_col:
-                df[col] = df[col].astype('category').cat.codes
+        df = self.encode_categoricals(df, categorical_cols.difference([target_col]))
         
         # Scale numerical features
         logger.debug("Scaling numerical features")
-        from sklearn.preprocessing import StandardScaler
-        
         feature_cols = self.get_feature_columns(df)
         numerical_cols = df[feature_cols].select_dtypes(include=['float64', 'int64']).columns
-        
-        if len(numerical_cols) > 0:
-            scaler = StandardScaler()
-            df[numerical_cols] = scaler.fit_transform(df[numerical_cols])
+        df = self.standardize(df, numerical_cols)
         
         logger.info("Preprocessing complete", rows=len(df), cols=len(df.columns))
         return df
     
     def load_raw_data(self) -> pd.DataFrame:
-        """Load raw German Credit data from CSV.
+        """Load raw German Credit data (CSV, cached as Parquet).
         
         Returns:
             Raw dataframe
@@ -107,11 +98,18 @@ class GermanCreditLoader(BaseDatasetLoader):
             'credit.csv',
         ]
         
+        return self.load_cached_raw(
+            lambda: self._read_source_csv(possible_files),
+            columns=self.config.get('keep_columns')
+        )
+    
+    def _read_source_csv(self, possible_files) -> pd.DataFrame:
+        """Parse the first matching source CSV."""
         for filename in possible_files:
             file_path = self.data_dir / filename
             if file_path.exists():
                 logger.info("Loading data from file", file=filename)
-                df = pd.read_csv(file_path)
+                df = fast_read_csv(file_path)
                 logger.info("Raw data loaded", rows=len(df), cols=len(df.columns))
                 return df
         
@@ -119,7 +117,7 @@ class GermanCreditLoader(BaseDatasetLoader):
         files = list(self.data_dir.glob('*.csv'))
         if files:
             logger.info("Using first CSV file found", file=files[0].name)
-            df = pd.read_csv(files[0])
+            df = fast_read_csv(files[0])
             return df
         
         raise FileNotFoundError(f"No CSV file found in {self.data_dir}")
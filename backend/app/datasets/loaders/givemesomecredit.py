@@ -2,9 +2,16 @@
 
 from pathlib import Path
 import pandas as pd
-from .base import BaseDatasetLoader
+from .base import BaseDatasetLoader, fast_read_csv
+from app.utils.kaggle_client import get_kaggle_api
 import structlog
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 logger = structlog.get_logger()
 
 
@@ -19,16 +26,9 @@ class GiveMeSomeCreditLoader(BaseDatasetLoader):
         """
         logger.info("Downloading Give Me Some Credit dataset", dataset_id=self.dataset_id)
         
-        # Initialize Kaggle client
-        from app.utils.kaggle_client import KaggleClient
-        kaggle_client = KaggleClient()
-        
         # For datasets (not competitions), we need to use the dataset API
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Download dataset
             dataset_name = self.config.get('kaggle_dataset', 'brycecf/give-me-some-credit-dataset')
@@ -69,32 +69,63 @@ class GiveMeSomeCreditLoader(BaseDatasetLoader):
         # Fill numerical columns with median
         numerical_cols = df.select_dtypes(include=['float64', 'int64']).columns
         target_col = self.get_target_column()
+        feature_num_cols = numerical_cols.difference([target_col])
         
-        for col in numerical_cols:
-            if col != target_col and df[col].isnull().any():
-                df[col] = df[col].fillna(df[col].median())
-        
-        # Remove outliers (values beyond 3 standard deviations)
-        logger.debug("Removing outliers")
-        for col in numerical_cols:
-            if col != target_col:
-                mean = df[col].mean()
-                std = df[col].std()
-                df[col] = df[col].clip(lower=mean - 3*std, upper=mean + 3*std)
+        if POLARS_AVAILABLE:
+            logger.debug("Imputing and clipping outliers with Polars")
+            df = self._fill_and_clip_polars(df, feature_num_cols)
+        else:
+            # One block-wide fill instead of a per-column assignment loop, which
+            # would split and re-consolidate the float block once per column
+            df[feature_num_cols] = df[feature_num_cols].fillna(df[feature_num_cols].median())
+            
+            # Remove outliers (values beyond 3 standard deviations)
+            logger.debug("Removing outliers")
+            stats = df[feature_num_cols].agg(['mean', 'std'])
+            lower = stats.loc['mean'] - 3 * stats.loc['std']
+            upper = stats.loc['mean'] + 3 * stats.loc['std']
+            df[feature_num_cols] = df[feature_num_cols].clip(lower=lower, upper=upper, axis=1)
         
         # Scale numerical features
         logger.debug("Scaling numerical features")
-        from sklearn.preprocessing import StandardScaler
-        
-        feature_cols = self.get_feature_columns(df)
-        scaler = StandardScaler()
-        df[feature_cols] = scaler.fit_transform(df[feature_cols])
+        df = self.standardize(df, self.get_feature_columns(df))
         
         logger.info("Preprocessing complete", rows=len(df), cols=len(df.columns))
         return df
     
+    @staticmethod
+    def _fill_and_clip_polars(df: pd.DataFrame, columns) -> pd.DataFrame:
+        """Median-fill and 3-sigma clip numeric columns in one Polars query.
+        
+        Same result as the pandas path (median of non-null values, sample
+        std for the clip bounds), but the fill and clip for every column run
+        as one multi-threaded lazy query instead of several block passes.
+        
+        Args:
+            df: Dataframe
+            columns: Numeric feature columns
+            
+        Returns:
+            Dataframe with the columns imputed and clipped
+        """
+        columns = list(columns)
+        if not columns:
+            return df
+        
+        filled = [pl.col(c).fill_null(pl.col(c).median()) for c in columns]
+        clipped = pl.from_pandas(df[columns]).lazy().with_columns(filled).with_columns([
+            pl.col(c).clip(
+                pl.col(c).mean() - 3 * pl.col(c).std(),
+                pl.col(c).mean() + 3 * pl.col(c).std()
+            )
+            for c in columns
+        ]).collect().to_pandas()
+        
+        df[columns] = clipped.set_axis(df.index)
+        return df
+    
     def load_raw_data(self) -> pd.DataFrame:
-        """Load raw Give Me Some Credit data from CSV.
+        """Load raw Give Me Some Credit data (CSV, cached as Parquet).
         
         Returns:
             Raw dataframe
@@ -106,11 +137,18 @@ class GiveMeSomeCreditLoader(BaseDatasetLoader):
             'givemesomecredit.csv',
         ]
         
+        return self.load_cached_raw(
+            lambda: self._read_source_csv(possible_files),
+            columns=self.config.get('keep_columns')
+        )
+    
+    def _read_source_csv(self, possible_files) -> pd.DataFrame:
+        """Parse the first matching source CSV."""
         for filename in possible_files:
             file_path = self.data_dir / filename
             if file_path.exists():
                 logger.info("Loading data from file", file=filename)
-                df = pd.read_csv(file_path)
+                df = fast_read_csv(file_path)
                 logger.info("Raw data loaded", rows=len(df), cols=len(df.columns))
                 return df
         
@@ -118,7 +156,7 @@ class GiveMeSomeCreditLoader(BaseDatasetLoader):
         files = list(self.data_dir.glob('*.csv'))
         if files:
             logger.info("Using first CSV file found", file=files[0].name)
-            df = pd.read_csv(files[0])
+            df = fast_read_csv(files[0])
             return df
         
         raise FileNotFoundError(f"No CSV file found in {self.data_dir}")
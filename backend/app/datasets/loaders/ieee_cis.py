@@ -1,13 +1,126 @@
 """IEEE-CIS Fraud Detection dataset loader."""
 
+import json
+import re
+import warnings
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from .base import BaseDatasetLoader
-from app.utils.kaggle_client import KaggleClient
 import structlog
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# Numeric feature families (counts, timedeltas, Vesta features) parsed as float32
+_FLOAT32_COLUMN = re.compile(r'^(C|D|V)\d+$|^dist[12]$|^TransactionAmt$')
+
+# String columns of train_transaction.csv parsed straight into categoricals
+_CATEGORY_COLUMNS = frozenset(
+    ['ProductCD', 'card4', 'card6', 'P_emaildomain', 'R_emaildomain']
+    + [f'M{i}' for i in range(1, 10)]
+)
+
+# Integer identifier/label columns of train_transaction.csv
+_INT_COLUMNS = frozenset(['TransactionID', 'isFraud', 'TransactionDT'])
+
+# Columns that survived the missing-value filter on a previous run
+KEPT_COLUMNS_FILE = 'ieee_cis_columns.json'
+
+# Bytes of CSV decoded per streamed record batch
+STREAM_BLOCK_SIZE = 64 << 20
+
+
+def _dtype_map(columns) -> Dict[str, object]:
+    """Build a read_csv dtype map for the given IEEE-CIS columns."""
+    dtypes = {}
+    for col in columns:
+        if _FLOAT32_COLUMN.match(col):
+            dtypes[col] = np.float32
+        elif col in _CATEGORY_COLUMNS:
+            dtypes[col] = 'category'
+    return dtypes
+
+
+def _arrow_types(columns) -> Dict[str, pa.DataType]:
+    """Arrow column types for streaming train_transaction.csv.
+    
+    Every column is typed explicitly so batch-wise type inference can never
+    disagree between blocks.
+    """
+    types = {}
+    for col in columns:
+        if col in _INT_COLUMNS:
+            types[col] = pa.int64()
+        elif col in _CATEGORY_COLUMNS:
+            types[col] = pa.dictionary(pa.int32(), pa.string())
+        else:
+            types[col] = pa.float32()
+    return types
+
+
+def _impute_numeric_block_numpy(X: np.ndarray):
+    """NumPy fallback for :func:`_impute_numeric_block`."""
+    missing = np.isnan(X)
+    missing_frac = missing.mean(axis=0) if len(X) else np.zeros(X.shape[1])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+        medians = np.nanmedian(X, axis=0)
+    rows, cols = np.nonzero(missing)
+    X[rows, cols] = medians[cols]
+    return missing_frac, X.var(axis=0)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _impute_numeric_block_numba(X):
+        n_rows, n_cols = X.shape
+        missing_frac = np.zeros(n_cols)
+        variances = np.full(n_cols, np.nan)
+        for j in prange(n_cols):
+            col = X[:, j]
+            present = col[~np.isnan(col)]
+            n_present = present.size
+            if n_rows > 0:
+                missing_frac[j] = (n_rows - n_present) / n_rows
+            if n_present == 0:
+                continue
+            if n_present < n_rows:
+                median = np.median(present)
+                for i in range(n_rows):
+                    if np.isnan(col[i]):
+                        col[i] = median
+            mean = col.mean()
+            variances[j] = ((col - mean) ** 2).mean()
+        return missing_frac, variances
+
+
+def _impute_numeric_block(X: np.ndarray):
+    """Median-impute a float32 feature block in place in a single column sweep.
+    
+    Per column, counts missing values, fills them with the column median and
+    computes the (population) variance of the filled column. Uses a parallel
+    numba kernel when numba is installed.
+    
+    Args:
+        X: Column-major (Fortran-ordered) float32 array, modified in place
+        
+    Returns:
+        Tuple of (missing fraction per column, variance per column)
+    """
+    if NUMBA_AVAILABLE:
+        return _impute_numeric_block_numba(X)
+    return _impute_numeric_block_numpy(X)
+
 
 class IEEECISLoader(BaseDatasetLoader):
     """Loader for IEEE-CIS Fraud Detection dataset."""
@@ -21,6 +134,7 @@ class IEEECISLoader(BaseDatasetLoader):
         logger.info("Downloading IEEE-CIS dataset", dataset_id=self.dataset_id)
         
         # Initialize Kaggle client
+        from app.utils.kaggle_client import KaggleClient
         kaggle_client = KaggleClient()
         
         # Download dataset
@@ -51,56 +165,216 @@ class IEEECISLoader(BaseDatasetLoader):
                    rows=len(df), 
                    cols=len(df.columns))
         
+        target_col = self.get_target_column()
+        
+        # Numeric block: missing fraction, median fill and variance in one sweep
+        logger.debug("Imputing numerical columns")
+        numerical_cols = df.select_dtypes(include=['float32', 'float64']).columns.difference([target_col])
+        X = np.asfortranarray(df[numerical_cols].to_numpy(dtype=np.float32, copy=True))
+        num_missing, num_variances = _impute_numeric_block(X)
+        
         # Drop columns with >50% missing values to save memory
         logger.debug("Dropping high-missing columns")
-        missing_pct = df.isnull().sum() / len(df)
-        cols_to_keep = missing_pct[missing_pct < 0.5].index.tolist()
-        df = df[cols_to_keep]
+        other_cols = df.columns.difference(numerical_cols)
+        other_missing = df[other_cols].isnull().mean()
+        keep = set(numerical_cols[num_missing < 0.5]) | set(other_missing[other_missing < 0.5].index)
+        cols_to_keep = [c for c in df.columns if c in keep]
+        self._save_kept_columns(cols_to_keep)
         logger.info(f"Kept {len(cols_to_keep)} columns with <50% missing values")
         
-        # Handle missing values
-        logger.debug("Handling missing values")
-        # For numerical columns, fill with median
-        numerical_cols = df.select_dtypes(include=['float64', 'int64']).columns
-        for col in numerical_cols:
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(df[col].median())
+        num_keep = num_missing < 0.5
+        filled = pd.DataFrame(X[:, num_keep], columns=numerical_cols[num_keep], index=df.index)
+        num_variances = pd.Series(num_variances[num_keep], index=filled.columns)
+        del X
+        df = pd.concat([df[other_cols.intersection(cols_to_keep)], filled], axis=1)[cols_to_keep]
         
-        # For categorical columns, fill with mode or 'unknown'
+        # For categorical columns, fill with 'unknown'
+        logger.debug("Handling missing values")
         categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-        for col in categorical_cols:
-            if df[col].isnull().any():
-                df[col] = df[col].fillna('unknown')
+        df = self.fill_categorical_missing(df, categorical_cols)
         
         # Encode categorical variables
         logger.debug("Encoding categorical variables")
-        target_col = self.get_target_column()
-        for col in categorical_cols:
-            if col != target_col:
-                df[col] = df[col].astype('category').cat.codes
+        df = self.encode_categoricals(df, categorical_cols.difference([target_col]))
         
         # Limit features to top 50 by variance to save memory
         logger.debug("Selecting top features by variance")
         feature_cols = self.get_feature_columns(df)
         
         if len(feature_cols) > 50:
-            # Calculate variance for each feature
-            variances = df[feature_cols].var()
-            top_features = variances.nlargest(50).index.tolist()
+            # Reuse the imputation-pass variances; compute the rest in one
+            # float32 pass, then pick the top 50 with a partial sort
+            rest = [c for c in feature_cols if c not in num_variances.index]
+            if rest:
+                rest_variances = pd.Series(df[rest].to_numpy(dtype=np.float32).var(axis=0), index=rest)
+                num_variances = pd.concat([num_variances, rest_variances])
+            variances = np.nan_to_num(num_variances.reindex(feature_cols).to_numpy(), nan=-np.inf)
+            top_idx = np.argpartition(-variances, 50)[:50]
+            top_idx = top_idx[np.argsort(-variances[top_idx], kind='stable')]
+            top_features = [feature_cols[i] for i in top_idx]
             df = df[top_features + [target_col]]
             logger.info(f"Selected top 50 features from {len(feature_cols)}")
         else:
             df = df[feature_cols + [target_col]]
         
+        # Store integer columns (target, IDs, counts) in the narrowest dtype;
+        # category codes are already narrow
+        int_cols = df.select_dtypes(include=['int64', 'int32']).columns
+        if len(int_cols) > 0:
+            df = df.assign(**{
+                col: pd.to_numeric(df[col], downcast='integer') for col in int_cols
+            })
+        
         logger.info("Preprocessing complete", features=len(df.columns) - 1)
         
         return df
     
+    def _load_kept_columns(self) -> Optional[set]:
+        """Columns kept by a previous preprocess run, if recorded."""
+        path = self.data_dir / KEPT_COLUMNS_FILE
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return set(json.load(f))
+    
+    def _save_kept_columns(self, columns: List[str]):
+        """Record the columns that passed the missing-value filter."""
+        try:
+            with open(self.data_dir / KEPT_COLUMNS_FILE, 'w') as f:
+                json.dump(list(columns), f)
+        except OSError as e:
+            logger.warning("Could not cache kept IEEE-CIS columns", error=str(e))
+    
+    def _read_csv(self, path: Path, keep: Optional[set], nrows: Optional[int]) -> pd.DataFrame:
+        """Read an IEEE-CIS CSV with column projection and explicit dtypes."""
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in header if keep is None or c in keep or c == 'TransactionID']
+        return pd.read_csv(
+            path,
+            usecols=usecols,
+            dtype=_dtype_map(usecols),
+            nrows=nrows,
+            engine='c',
+            low_memory=False
+        )
+    
     def load_raw_data(self) -> pd.DataFrame:
-        """Load raw IEEE-CIS data from CSV files with memory optimization.
+        """Load raw IEEE-CIS data (CSV, cached as Parquet) with memory optimization.
+        
+        The transaction file is streamed in Arrow record batches; numeric
+        feature columns are decoded as float32 and known string columns as
+        categoricals. If a previous run recorded which columns survive the
+        missing-value filter, only those are read.
+        
+        Returns:
+            Combined dataframe
+        """
+        keep = self._load_kept_columns()
+        if keep is not None:
+            keep.add(self.get_target_column())
+            logger.info("Using cached column projection", columns=len(keep))
+        
+        columns = sorted(keep) if keep is not None else self.config.get('keep_columns')
+        return self.load_cached_raw(lambda: self._read_source_csv(keep), columns=columns)
+    
+    def _stream_transactions(
+        self,
+        path: Path,
+        include: Optional[List[str]] = None,
+        max_rows: Optional[int] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream train_transaction.csv as Arrow record batches.
+        
+        Args:
+            path: CSV path
+            include: Columns to decode (None for all)
+            max_rows: Stop after this many rows (None for all)
+        """
+        header = pd.read_csv(path, nrows=0).columns
+        columns = [c for c in header if include is None or c in include]
+        reader = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=STREAM_BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(
+                column_types=_arrow_types(columns),
+                include_columns=columns
+            )
+        )
+        
+        rows = 0
+        for batch in reader:
+            if max_rows is not None and rows + batch.num_rows > max_rows:
+                batch = batch.slice(0, max_rows - rows)
+            rows += batch.num_rows
+            yield batch
+            if max_rows is not None and rows >= max_rows:
+                break
+    
+    def _transaction_column_stats(self, path: Path, max_rows: Optional[int]) -> pd.DataFrame:
+        """First streaming pass: per-column missing fraction and variance.
+        
+        Keeps O(ncols) state: a null counter plus Welford accumulators
+        (count, mean, M2) for every numeric column, merged batch by batch
+        from Arrow's count/mean/variance kernels (Chan et al. parallel
+        combination).
         
         Returns:
-            Combined dataframe (sampled for memory efficiency)
+            DataFrame indexed by column with 'missing_pct' and 'variance'
+            (population variance of the non-null values; NaN for
+            non-numeric columns)
+        """
+        names = None
+        numeric = None
+        null_counts = count = mean = m2 = None
+        total_rows = 0
+        
+        for batch in self._stream_transactions(path, max_rows=max_rows):
+            if names is None:
+                names = batch.schema.names
+                numeric = np.array([
+                    pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                    for field in batch.schema
+                ])
+                null_counts = np.zeros(len(names), dtype=np.int64)
+                count = np.zeros(len(names))
+                mean = np.zeros(len(names))
+                m2 = np.zeros(len(names))
+            
+            null_counts += [column.null_count for column in batch.columns]
+            total_rows += batch.num_rows
+            
+            for i in np.flatnonzero(numeric):
+                column = batch.column(i)
+                n_b = column.length() - column.null_count
+                if n_b == 0:
+                    continue
+                mean_b = pc.mean(column).as_py()
+                m2_b = pc.variance(column, ddof=0).as_py() * n_b
+                n_a = count[i]
+                n = n_a + n_b
+                delta = mean_b - mean[i]
+                mean[i] += delta * n_b / n
+                m2[i] += m2_b + delta * delta * n_a * n_b / n
+                count[i] = n
+        
+        if names is None or total_rows == 0:
+            return pd.DataFrame(columns=['missing_pct', 'variance'], dtype='float64')
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(numeric & (count > 0), m2 / count, np.nan)
+        return pd.DataFrame(
+            {'missing_pct': null_counts / total_rows, 'variance': variance},
+            index=names
+        )
+    
+    def _read_source_csv(self, keep: Optional[set]) -> pd.DataFrame:
+        """Stream and merge the transaction and identity CSVs.
+        
+        Without a recorded column projection, a first streaming pass collects
+        null counts and Welford variance per column so that only columns with
+        <50% missing values (and non-constant values) are decoded in the
+        second pass. Only the kept columns are ever
+        materialized, which bounds peak memory to the final frame.
         """
         transaction_file = self.data_dir / 'train_transaction.csv'
         identity_file = self.data_dir / 'train_identity.csv'
@@ -108,29 +382,43 @@ class IEEECISLoader(BaseDatasetLoader):
         if not transaction_file.exists():
             raise FileNotFoundError(f"Transaction file not found: {transaction_file}")
         
-        logger.info("Loading transaction data with sampling for memory efficiency")
+        # Optional row cap from the registry (None streams all 590k rows)
+        max_rows = self.config.get('max_rows')
         
-        # Sample 100k rows instead of all 590k to fit in memory
-        # This is sufficient for XAI research and model training
-        sample_size = 100000
+        if keep is None:
+            logger.info("Scanning transaction data for missing values and variance")
+            stats = self._transaction_column_stats(transaction_file, max_rows)
+            stats = stats[stats['missing_pct'] < 0.5]
+            
+            # Constant columns stay constant after median imputation, so they
+            # can never reach the top-50 variance cut while enough columns
+            # with signal remain; skip decoding them
+            constant = stats.index[stats['variance'] == 0]
+            if len(stats) - len(constant) > 50:
+                stats = stats.drop(index=constant.difference([self.get_target_column(), 'TransactionID']))
+            include = stats.index.tolist()
+        else:
+            include = None
         
-        # Read with sampling to reduce memory usage
-        transaction_df = pd.read_csv(
-            transaction_file,
-            nrows=sample_size,
-            low_memory=True
-        )
+        header = pd.read_csv(transaction_file, nrows=0).columns
+        include = [
+            c for c in header
+            if (include is None or c in include) and (keep is None or c in keep or c == 'TransactionID')
+        ]
+        
+        logger.info("Streaming transaction data", columns=len(include), max_rows=max_rows)
+        batches = list(self._stream_transactions(transaction_file, include=include, max_rows=max_rows))
+        table = pa.Table.from_batches(batches) if batches else pa.table({c: [] for c in include})
+        del batches
+        transaction_df = table.to_pandas(self_destruct=True, split_blocks=True)
+        del table
         
-        logger.info(f"Loaded {len(transaction_df)} transaction rows (sampled for memory efficiency)")
+        logger.info(f"Loaded {len(transaction_df)} transaction rows")
         
         # Identity file is optional
         if identity_file.exists():
             logger.info("Loading identity data")
-            identity_df = pd.read_csv(
-                identity_file,
-                nrows=sample_size,
-                low_memory=True
-            )
+            identity_df = self._read_csv(identity_file, keep, nrows=None)
             
             # Merge on TransactionID
             logger.info("Merging transaction and identity data")
@@ -1,13 +1,27 @@
 """Dataset registry management."""
 
+import functools
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional
 import structlog
 
+try:
+    # libyaml-backed loader/dumper (~10x faster than the pure-Python ones)
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 logger = structlog.get_logger()
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int):
+    """Parse a YAML file; cached per (path, modification time)."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
 class DatasetRegistry:
     """Manages dataset configurations from YAML registry."""
     
@@ -48,8 +62,10 @@ class DatasetRegistry:
                              path=str(self.config_path))
                 return {}
             
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = _parse_yaml(
+                str(self.config_path),
+                self.config_path.stat().st_mtime_ns
+            )
             
             if not config or 'datasets' not in config:
                 logger.warning("No datasets found in registry")
@@ -59,7 +75,8 @@ class DatasetRegistry:
             datasets = {}
             for dataset in config.get('datasets', []):
                 if 'id' in dataset:
-                    datasets[dataset['id']] = dataset
+                    # Copy so in-place updates never touch the cached parse
+                    datasets[dataset['id']] = dict(dataset)
                 else:
                     logger.warning("Dataset missing 'id' field", dataset=dataset)
             
@@ -215,7 +232,7 @@ class DatasetRegistry:
             config = {'datasets': list(self.datasets.values())}
             
             with open(self.config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             
             logger.info("Dataset registry saved", path=str(self.config_path))
             return True
@@ -2,32 +2,42 @@
 FastAPI main application.
 """
 
-from fastapi import FastAPI, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+from starlette.routing import Route
 from contextlib import asynccontextmanager
+from typing import Optional
+import logging
+import orjson
 import structlog
 
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.log_sink import log_sink
+from app.core.middleware import CORSAndErrorsMiddleware, SelectiveGZipMiddleware
 from app.api.v1.api import api_router
 
-# Configure structured logging
+
+# Configure structured logging. The filtering bound logger turns calls below
+# LOG_LEVEL into no-ops before any processor runs; JSON lines are rendered to
+# bytes by orjson and handed to a background writer thread, so request
+# handlers only enqueue them.
+_json_logs = settings.LOG_FORMAT == "json"
+
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json" else structlog.dev.ConsoleRenderer(),
+        structlog.processors.JSONRenderer(serializer=orjson.dumps) if _json_logs else structlog.dev.ConsoleRenderer(),
     ],
+    wrapper_class=structlog.make_filtering_bound_logger(
+        logging.getLevelName(settings.LOG_LEVEL.upper())
+    ),
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
+    logger_factory=log_sink.logger_factory,
     cache_logger_on_first_use=True,
 )
 
@@ -38,6 +48,7 @@ logger = structlog.get_logger()
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
+    log_sink.start()
     logger.info("Starting application", app_name=settings.APP_NAME, version=settings.APP_VERSION)
     logger.info("CORS origins configured", origins=settings.BACKEND_CORS_ORIGINS)
     
@@ -58,6 +69,12 @@ async def lifespan(app: FastAPI):
         logger.info("Database connections closed")
     except Exception as e:
         logger.warning("Database close failed", error=str(e))
+    
+    # Finish background R2 uploads of processed datasets
+    from app.services.kaggle_service import kaggle_service
+    kaggle_service.shutdown()
+    
+    log_sink.stop()
 
 
 # Create FastAPI app
@@ -69,6 +86,7 @@ app = FastAPI(
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware - Parse origins properly
@@ -86,70 +104,87 @@ if isinstance(cors_origins, str):
 
 logger.info("Setting up CORS middleware", origins=cors_origins, origins_count=len(cors_origins))
 
+# GZip compression. Added first so it sits inside the CORS layer: preflights
+# are answered before it runs. Bodies under one MTU are sent uncompressed
+# (compressing them costs more than the bytes saved). Server-sent event
+# streams are never compressed, so each event reaches the client as sent.
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
+    SelectiveGZipMiddleware,
+    minimum_size=1400,
+    exclude_paths=frozenset({f"{settings.API_V1_PREFIX}/interpretation/stream"}),
 )
 
-# GZip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-
-
-# Global exception handler to ensure CORS headers on errors
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    """Ensure CORS headers are present even on unhandled exceptions."""
-    logger.error("Unhandled exception", exc_info=exc, path=request.url.path)
-    
-    response = JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"detail": "Internal server error"}
-    )
-    
-    # Manually add CORS headers
-    origin = request.headers.get("origin")
-    if origin and origin in cors_origins:
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-    
-    return response
+# CORS and unhandled-exception handling in one pure ASGI layer; the 500
+# response carries the CORS headers so browsers can read it. Last added is
+# outermost.
+app.add_middleware(CORSAndErrorsMiddleware, origins=frozenset(cors_origins))
 
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+# Constant bodies of the probe endpoints, serialized once
+_ROOT_BODY = orjson.dumps({
+    "name": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "status": "running",
+    "docs": f"{settings.API_V1_PREFIX}/docs",
+})
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "docs": f"{settings.API_V1_PREFIX}/docs",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Basic health check."""
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@app.get("/docs")
-async def docs_redirect():
-    """Redirect to API documentation."""
-    from fastapi.responses import RedirectResponse
-    return RedirectResponse(url=f"{settings.API_V1_PREFIX}/docs")
+def _permanent_redirect(url: str):
+    """Starlette endpoint returning a browser-cacheable 308 redirect."""
+    headers = {"Cache-Control": "public, max-age=86400"}
+    
+    async def redirect(request):
+        return RedirectResponse(url=url, status_code=308, headers=headers)
+    
+    return redirect
+
+
+# Constant redirects to the API docs, registered as plain Starlette routes
+# (no FastAPI dependency/validation layer) and cached by browsers
+app.router.routes.append(
+    Route("/docs", endpoint=_permanent_redirect(f"{settings.API_V1_PREFIX}/docs"), methods=["GET"], include_in_schema=False)
+)
+app.router.routes.append(
+    Route("/redoc", endpoint=_permanent_redirect(f"{settings.API_V1_PREFIX}/redoc"), methods=["GET"], include_in_schema=False)
+)
 
 
-@app.get("/redoc")
-async def redoc_redirect():
-    """Redirect to ReDoc documentation."""
-    from fastapi.responses import RedirectResponse
-    return RedirectResponse(url=f"{settings.API_V1_PREFIX}/redoc")
+# OpenAPI schema: FastAPI memoizes the schema dict but re-serializes it on
+# every request; replace its route with one that serves bytes encoded once
+# (lazily, after every router has been included)
+_openapi_body: Optional[bytes] = None
+
+
+async def openapi_json(request):
+    """Serve the OpenAPI schema from cached bytes."""
+    global _openapi_body
+    if _openapi_body is None:
+        _openapi_body = orjson.dumps(app.openapi())
+    return Response(content=_openapi_body, media_type="application/json")
+
+
+app.router.routes[:] = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != app.openapi_url
+]
+app.router.routes.append(
+    Route(app.openapi_url, endpoint=openapi_json, methods=["GET"], include_in_schema=False)
+)
 # Force redeploy - Sun Oct 12 19:38:44 CEST 2025
@@ -1,9 +1,9 @@
 """Dataset model."""
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, enum_check
 
 
 class DatasetStatus(str, enum.Enum):
@@ -19,14 +19,17 @@ class Dataset(Base):
     """Dataset model for tracking datasets."""
     
     __tablename__ = "datasets"
+    __table_args__ = (
+        enum_check("status", DatasetStatus, "ck_dataset_status"),
+    )
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     name = Column(String, nullable=False, index=True)
     description = Column(String)
     source = Column(String, nullable=False)  # e.g., "kaggle", "upload"
     source_identifier = Column(String)  # e.g., Kaggle dataset ID
     
-    status = Column(SQLEnum(DatasetStatus), default=DatasetStatus.PENDING, nullable=False)
+    status = Column(String(16), default=DatasetStatus.PENDING.value, server_default=DatasetStatus.PENDING.value, nullable=False, index=True)
     
     # File information
     file_path = Column(String)
@@ -1,13 +1,13 @@
 """Explanation and metrics models."""
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Enum as SQLEnum, ForeignKey, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Boolean, UniqueConstraint
 import enum
-from app.core.database import Base
+from app.core.database import Base, enum_check, utc_now
 
 
 class ExplanationMethod(str, enum.Enum):
     """XAI explanation methods."""
+    SHAP = "shap"  # Written by the explanation service (explainer chosen per model)
     SHAP_TREE = "shap_tree"
     SHAP_KERNEL = "shap_kernel"
     LIME = "lime"
@@ -17,10 +17,21 @@ class Explanation(Base):
     """XAI explanation tracking."""
     
     __tablename__ = "explanations"
+    __table_args__ = (
+        # Canonical cache key: dedups explanations, backs ON CONFLICT upserts
+        # and the cache-hit lookup; its model_id prefix also serves per-model
+        # queries. NULL instance_ids (global explanations) count as equal.
+        UniqueConstraint(
+            "model_id", "method", "is_global", "instance_id",
+            name="uq_expl_canonical",
+            postgresql_nulls_not_distinct=True,
+        ),
+        enum_check("method", ExplanationMethod, "ck_explanation_method"),
+    )
     
-    id = Column(String, primary_key=True, index=True)
-    model_id = Column(String, ForeignKey("models.id"), nullable=False, index=True)
-    method = Column(SQLEnum(ExplanationMethod), nullable=False, index=True)
+    id = Column(String, primary_key=True)
+    model_id = Column(String, ForeignKey("models.id"), nullable=False)
+    method = Column(String(16), nullable=False, index=True)
     
     # Explanation type
     is_global = Column(Boolean, default=False, nullable=False)
@@ -35,14 +46,14 @@ class Explanation(Base):
     file_size_mb = Column(Float)
     
     # Caching
-    cache_key = Column(String, unique=True, index=True)
+    cache_key = Column(String)  # Informational; uniqueness is uq_expl_canonical
     cached_until = Column(DateTime(timezone=True))
     
     # Computation info
     computation_time_seconds = Column(Float)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
 
 
 class ExplanationMetrics(Base):
@@ -50,7 +61,7 @@ class ExplanationMetrics(Base):
     
     __tablename__ = "explanation_metrics"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     explanation_id = Column(String, ForeignKey("explanations.id"), nullable=False, index=True)
     
     # Faithfulness metrics
@@ -69,4 +80,4 @@ class ExplanationMetrics(Base):
     additional_metrics = Column(JSON)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
@@ -1,9 +1,9 @@
 """Model and metrics models."""
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Enum as SQLEnum, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Boolean
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, enum_check
 
 
 class ModelStatus(str, enum.Enum):
@@ -18,8 +18,11 @@ class Model(Base):
     """ML model tracking."""
     
     __tablename__ = "models"
+    __table_args__ = (
+        enum_check("status", ModelStatus, "ck_model_status"),
+    )
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     name = Column(String, nullable=False, index=True)
     model_type = Column(String, nullable=False, index=True)  # xgboost, random_forest, etc.
     version = Column(String, nullable=False)
@@ -28,7 +31,7 @@ class Model(Base):
     dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False, index=True)
     
     # Training status
-    status = Column(SQLEnum(ModelStatus), default=ModelStatus.PENDING, nullable=False)
+    status = Column(String(16), default=ModelStatus.PENDING.value, server_default=ModelStatus.PENDING.value, nullable=False, index=True)
     
     # Model configuration
     hyperparameters = Column(JSON)
@@ -57,7 +60,7 @@ class ModelMetrics(Base):
     
     __tablename__ = "model_metrics"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     model_id = Column(String, ForeignKey("models.id"), nullable=False, index=True)
     
     # Classification metrics
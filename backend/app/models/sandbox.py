@@ -9,7 +9,7 @@ class SandboxInstance(Base):
     """Stores test samples used in sandbox for reproducibility"""
     __tablename__ = "sandbox_instances"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     instance_id = Column(String(255), unique=True, nullable=False, index=True)
     model_id = Column(String(255), ForeignKey("models.model_id", ondelete="CASCADE"), nullable=False)
     sample_index = Column(Integer, nullable=False)
@@ -22,7 +22,7 @@ class ExplanationRating(Base):
     """Stores human interpretability ratings for research"""
     __tablename__ = "explanation_ratings"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     rating_id = Column(String(255), unique=True, nullable=False, index=True)
     model_id = Column(String(255), ForeignKey("models.model_id", ondelete="CASCADE"), nullable=False)
     instance_id = Column(String(255), nullable=False)
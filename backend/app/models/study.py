@@ -1,8 +1,7 @@
 """Human study models."""
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Boolean
-from sqlalchemy.sql import func
-from app.core.database import Base
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Boolean, Index
+from app.core.database import Base, utc_now
 
 
 class StudySession(Base):
@@ -10,7 +9,7 @@ class StudySession(Base):
     
     __tablename__ = "study_sessions"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     session_id = Column(String, unique=True, nullable=False, index=True)  # Pseudonymous ID
     
     # Session configuration
@@ -26,7 +25,7 @@ class StudySession(Base):
     completed = Column(Boolean, default=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
     completed_at = Column(DateTime(timezone=True))
 
 
@@ -34,9 +33,13 @@ class StudyInteraction(Base):
     """Individual study interaction."""
     
     __tablename__ = "study_interactions"
+    __table_args__ = (
+        # Interactions of a session in order; also serves session_id lookups
+        Index("ix_interaction_session_created", "session_id", "created_at"),
+    )
     
-    id = Column(String, primary_key=True, index=True)
-    session_id = Column(String, ForeignKey("study_sessions.id"), nullable=False, index=True)
+    id = Column(String, primary_key=True)
+    session_id = Column(String, ForeignKey("study_sessions.id"), nullable=False)
     
     # Transaction data
     transaction_id = Column(String, nullable=False)
@@ -57,4 +60,4 @@ class StudyInteraction(Base):
     response_time_seconds = Column(Float)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
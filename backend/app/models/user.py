@@ -1,9 +1,9 @@
 """User model."""
 
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, enum_check
 
 
 class UserRole(str, enum.Enum):
@@ -16,13 +16,16 @@ class User(Base):
     """User model for researchers."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        enum_check("role", UserRole, "ck_user_role"),
+    )
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String)
     
-    role = Column(SQLEnum(UserRole), default=UserRole.RESEARCHER, nullable=False)
+    role = Column(String(16), default=UserRole.RESEARCHER.value, server_default=UserRole.RESEARCHER.value, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
@@ -2,33 +2,432 @@
 Explanation generation service for SHAP and LIME.
 """
 
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from importlib.util import find_spec
 from pathlib import Path
+import hashlib
+import io
+import threading
 import uuid
 import structlog
 import pandas as pd
 import numpy as np
 import json
 
+from app.core.config import settings
 from app.utils.r2_storage import r2_storage_client
 from app.utils.supabase_client import supabase_db
 from app.core.data_access import dal
 
 logger = structlog.get_logger()
 
+# Model types explained with TreeSHAP (polynomial time, no background sample)
+# instead of KernelExplainer (exponential in the number of features)
+_TREE_MODELS = frozenset({
+    'xgboost', 'lightgbm', 'catboost', 'random_forest',
+    'gradient_boosting', 'extra_trees', 'decision_tree',
+})
+
+# FastTreeSHAP: same TreeExplainer API with a faster recursion; checked
+# without importing (it loads with shap on first use)
+FASTTREESHAP_AVAILABLE = find_spec("fasttreeshap") is not None
+
+# Fitted explainers kept in memory per process (least recently used evicted).
+# No TTL: an explainer is fully determined by its model, and a retrained
+# model gets a new ID
+EXPLAINER_CACHE_SIZE = 16
+
+# KernelExplainer background (k-means centroids; its cost is linear in
+# this), and the LASSO feature cap for its inner regression (bounds cost
+# regardless of feature count)
+KERNEL_BACKGROUND_SIZE = 20
+KERNEL_L1_REG = 'num_features(10)'
+
+# Smallest batch worth running TreeSHAP on the GPU (kernel launch and
+# tree upload dominate below this)
+GPU_TREESHAP_MIN_ROWS = 1000
+
+# Packages whose model objects TreeExplainer supports natively
+_TREE_MODEL_PACKAGES = frozenset({'xgboost', 'lightgbm', 'catboost'})
+
+
+def _is_tree_model(model: Any, model_type: str) -> bool:
+    """
+    Whether a model can use TreeExplainer.
+    
+    Checks the registered model type first, then the model object itself so
+    tree ensembles stored under another type name still take the fast path.
+    """
+    if model_type in _TREE_MODELS:
+        return True
+    if type(model).__module__.split('.')[0] in _TREE_MODEL_PACKAGES:
+        return True
+    
+    from sklearn.ensemble import (
+        ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+    )
+    from sklearn.tree import BaseDecisionTree
+    return isinstance(model, (
+        BaseDecisionTree, RandomForestClassifier, ExtraTreesClassifier, GradientBoostingClassifier
+    ))
+
+
+def _cached_artifact(remote_path: str, relative_path: str) -> Path:
+    """
+    Local copy of an R2 artifact under ``settings.ARTIFACT_CACHE_DIR``.
+    
+    Downloaded once (to a temporary name, then renamed so concurrent
+    readers never see a partial file) and reused by later calls.
+    
+    Args:
+        remote_path: R2 key
+        relative_path: Path of the copy below the cache directory
+        
+    Returns:
+        Path of the local copy
+    """
+    local_path = Path(settings.ARTIFACT_CACHE_DIR) / relative_path
+    if local_path.exists():
+        return local_path
+    
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = local_path.with_name(f"{local_path.name}.{uuid.uuid4().hex[:8]}.part")
+    if not r2_storage_client.download_file(remote_path, str(partial_path)):
+        raise RuntimeError(f"Failed to download {remote_path} from R2")
+    partial_path.replace(local_path)
+    return local_path
+
+
+def _load_model(model_path: Path) -> Any:
+    """
+    Load a trained model with its numpy arrays memory-mapped read-only.
+    
+    Models written by ``joblib.dump(..., compress=0)`` share the tree arrays
+    through the page cache instead of copying them onto the heap; older
+    plain-pickle models still load (without mapping).
+    """
+    import joblib
+    return joblib.load(model_path, mmap_mode='r')
+
+
+def _dataset_version(dataset: Dict[str, Any]) -> str:
+    """Short token identifying a dataset's processed version (from its timestamps)."""
+    stamp = f"{dataset.get('updated_at')}|{dataset.get('last_updated')}"
+    return hashlib.blake2b(stamp.encode(), digest_size=8).hexdigest()
+
+
+def _fetch_artifacts(
+    model_id: str, model: Dict[str, Any], dataset: Dict[str, Any]
+) -> Tuple[Path, Path]:
+    """
+    Local paths of a model's pickle and its dataset's test split.
+    
+    The two R2 fetches are independent, so on a cache miss they run
+    concurrently and the prologue costs the slower download, not the sum.
+    The test split is cached per dataset version (its ``updated_at`` /
+    ``last_updated``), so reprocessing a dataset fetches the new split.
+    
+    Returns:
+        Tuple of (model path, test parquet path)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        model_future = executor.submit(
+            _cached_artifact, model['model_path'], f"models/{model_id}/model.pkl"
+        )
+        test_future = executor.submit(
+            _cached_artifact,
+            f"{dataset['file_path']}/test.parquet",
+            f"datasets/{model['dataset_id']}/{_dataset_version(dataset)}/test.parquet"
+        )
+        return model_future.result(), test_future.result()
+
+
+@lru_cache(maxsize=8)
+def _load_test_df(path: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    Parse a cached test split once per process (``mtime_ns`` is part of the
+    key so a re-downloaded file is re-read). Callers must not mutate it.
+    """
+    return pd.read_parquet(path)
+
+
+def _read_test_rows(path: Path, row_indices: List[int]) -> pd.DataFrame:
+    """
+    Read selected rows of a parquet test split, decoding only the row
+    groups that contain them.
+    
+    Args:
+        path: Local parquet file
+        row_indices: Positional row indices (validated against the footer)
+        
+    Returns:
+        DataFrame with the requested rows, in request order
+    """
+    import pyarrow.parquet as pq
+    
+    parquet_file = pq.ParquetFile(path)
+    num_rows = parquet_file.metadata.num_rows
+    for row_index in row_indices:
+        if row_index < 0 or row_index >= num_rows:
+            raise ValueError(f"Sample index {row_index} out of range [0, {num_rows-1}]")
+    
+    # Row group boundaries from the footer, no data pages touched
+    group_starts = np.cumsum(
+        [0] + [parquet_file.metadata.row_group(g).num_rows for g in range(parquet_file.num_row_groups)]
+    )
+    rows = np.asarray(row_indices, dtype=np.int64)
+    row_groups = np.searchsorted(group_starts, rows, side='right') - 1
+    needed = np.unique(row_groups)
+    
+    # Position of each requested row inside the concatenation of the needed groups
+    needed_sizes = group_starts[needed + 1] - group_starts[needed]
+    needed_offsets = dict(zip(needed.tolist(), np.cumsum(needed_sizes) - needed_sizes))
+    positions = [
+        int(needed_offsets[group] + row - group_starts[group])
+        for group, row in zip(row_groups.tolist(), rows.tolist())
+    ]
+    
+    table = parquet_file.read_row_groups(needed.tolist())
+    return table.take(positions).to_pandas()
+
+
+def _as_float32(X: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float64 feature columns to float32.
+    
+    Tree models predict in float32 anyway (sklearn and XGBoost convert their
+    input), so this halves the bytes SHAP/LIME move without changing
+    predictions; preprocessing already writes scaled features as float32.
+    """
+    float64_cols = X.columns[X.dtypes == np.float64]
+    if len(float64_cols) == 0:
+        return X
+    return X.astype({col: np.float32 for col in float64_cols})
+
+
+def _explain_lime_instance(
+    explainer, row: np.ndarray, predict_fn, idx: int, num_features: int, num_samples: int,
+    seed: int
+):
+    """
+    Explain one instance with LIME (module-level so worker processes can
+    unpickle it; ``predict_fn`` is a bound method, not a lambda, for the
+    same reason).
+    
+    ``seed`` gives the instance its own perturbation stream, so results are
+    reproducible regardless of which worker runs it.
+    
+    Returns:
+        Tuple of (instance index, LIME (feature, weight) list)
+    """
+    # ``explainer`` is this task's own (unpickled) copy
+    explainer.random_state = np.random.RandomState(seed)
+    # LIME draws all ``num_samples`` perturbations up front and scores them
+    # with a single ``predict_fn`` call on the full matrix, so the model's
+    # vectorised predict_proba already sees one batch per instance
+    exp = explainer.explain_instance(
+        row, predict_fn, num_features=num_features, num_samples=num_samples
+    )
+    return idx, exp.as_list()
+
+
+def _make_shap_explainer(model: Any, model_type: str, X: pd.DataFrame, background_size: int):
+    """
+    Build the SHAP explainer for a model.
+    
+    Args:
+        model: Trained model
+        model_type: Registered model type
+        X: Data to draw the KernelExplainer background sample from
+        background_size: Maximum KernelExplainer background centroids
+        
+    Returns:
+        TreeExplainer for tree models (FastTreeSHAP's when available and
+        enabled), KernelExplainer otherwise
+    """
+    import shap
+    
+    if _is_tree_model(model, model_type):
+        if FASTTREESHAP_AVAILABLE and settings.SHAP_USE_FASTTREESHAP:
+            import fasttreeshap
+            return fasttreeshap.TreeExplainer(
+                model, feature_perturbation='tree_path_dependent', algorithm='auto', n_jobs=-1
+            )
+        return shap.TreeExplainer(model, feature_perturbation='tree_path_dependent')
+    
+    # Use KernelExplainer for other models (slower) over weighted k-means
+    # centroids (deterministic, so a refit matches the cached explainer)
+    background = shap.kmeans(X, min(background_size, len(X)))
+    return shap.KernelExplainer(model.predict_proba, background)
+
+
+@lru_cache(maxsize=1)
+def _gpu_available() -> bool:
+    """Whether a CUDA device is visible (probed once, via cupy if installed)."""
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def _shap_values(explainer: Any, X: pd.DataFrame, approximate: bool = False):
+    """
+    SHAP values for ``X``.
+    
+    KernelExplainer's LASSO is capped at ``KERNEL_L1_REG``. With
+    ``approximate``, tree explainers use the Saabas path approximation and
+    skip the additivity check (an extra full predict over ``X``); meant for
+    aggregated views such as mean |SHAP| where exact attributions are not
+    needed.
+    """
+    import shap
+    
+    if isinstance(explainer, shap.KernelExplainer):
+        return explainer.shap_values(X, l1_reg=KERNEL_L1_REG)
+    if approximate:
+        return explainer.shap_values(X, approximate=True, check_additivity=False)
+    return explainer.shap_values(X)
+
+
+def _expected_value(explainer: Any) -> float:
+    """
+    Positive-class base value of a SHAP explainer (0.0 if it has none).
+    
+    Explainers of sklearn classifiers (forests, KernelExplainer over
+    ``predict_proba``) hold one expected value per class; boosted trees
+    hold a single margin.
+    """
+    if not hasattr(explainer, 'expected_value'):
+        return 0.0
+    return float(np.ravel(explainer.expected_value)[-1])
+
 
 class ExplanationService:
     """Service for generating and managing model explanations."""
     
     def __init__(self):
         """Initialize with cache for explainers."""
-        self._explainer_cache = {}  # Cache explainers by model_id
+        # LRU cache of explainers keyed by (model_id, model_type); used from
+        # worker threads, so every access goes through _explainer_lock
+        self._explainer_cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._explainer_lock = threading.Lock()
+        # Per-key locks so concurrent misses load or fit an explainer once
+        self._explainer_build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    
+    def _cached_explainer(self, cache_key: Tuple[str, str]):
+        """Return the cached explainer for a key (marking it recently used), or None."""
+        with self._explainer_lock:
+            explainer = self._explainer_cache.get(cache_key)
+            if explainer is not None:
+                self._explainer_cache.move_to_end(cache_key)
+            return explainer
+    
+    def _get_explainer(
+        self,
+        model_id: str,
+        model: Dict[str, Any],
+        trained_model: Any,
+        load_X_test: Callable[[], pd.DataFrame],
+        temp_dir: Path
+    ):
+        """
+        Get the SHAP explainer for a model: memory, then R2, then fit.
+        
+        Fitted explainers are pickled to R2 next to the model
+        (``{model_path}.explainer.pkl``) so a restarted process loads them
+        instead of refitting.
+        
+        Args:
+            model_id: ID of the trained model
+            model: Model record (needs 'model_type' and 'model_path')
+            trained_model: Loaded model object
+            load_X_test: Returns the test features (background source);
+                only called when the explainer has to be fitted
+            temp_dir: Directory for the pickle's scratch files (may be shared
+                by concurrent requests; files are written under unique names)
+            
+        Returns:
+            SHAP explainer
+        """
+        cache_key = (model_id, model['model_type'])
+        explainer = self._cached_explainer(cache_key)
+        if explainer is not None:
+            return explainer
+        
+        # Concurrent misses for the same key wait for the first one instead
+        # of each downloading or fitting (and uploading) the explainer
+        with self._explainer_lock:
+            build_lock = self._explainer_build_locks.setdefault(cache_key, threading.Lock())
+        
+        with build_lock:
+            explainer = self._cached_explainer(cache_key)
+            if explainer is not None:
+                return explainer
+            
+            explainer = self._load_or_fit_explainer(
+                model_id, model, trained_model, load_X_test, temp_dir
+            )
+            
+            with self._explainer_lock:
+                self._explainer_cache[cache_key] = explainer
+                if len(self._explainer_cache) > EXPLAINER_CACHE_SIZE:
+                    self._explainer_cache.popitem(last=False)
+                self._explainer_build_locks.pop(cache_key, None)
+        return explainer
+    
+    def _load_or_fit_explainer(
+        self,
+        model_id: str,
+        model: Dict[str, Any],
+        trained_model: Any,
+        load_X_test: Callable[[], pd.DataFrame],
+        temp_dir: Path
+    ):
+        """Load the persisted explainer from R2, or fit and persist a new one."""
+        import pickle
+        
+        explainer = None
+        remote_path = f"{model['model_path']}.explainer.pkl"
+        # Unique per call: temp_dir can be the shared artifact cache directory
+        local_path = temp_dir / f"explainer.{uuid.uuid4().hex[:8]}.part"
+        
+        try:
+            if r2_storage_client.file_exists(remote_path):
+                if r2_storage_client.download_file(remote_path, str(local_path)):
+                    try:
+                        with open(local_path, 'rb') as f:
+                            explainer = pickle.load(f)
+                        logger.info("Explainer loaded from R2", model_id=model_id)
+                    except Exception as e:
+                        logger.warning("Failed to load persisted explainer", model_id=model_id, error=str(e))
+            
+            if explainer is None:
+                explainer = _make_shap_explainer(
+                    trained_model, model['model_type'], load_X_test(),
+                    background_size=KERNEL_BACKGROUND_SIZE
+                )
+                try:
+                    with open(local_path, 'wb') as f:
+                        pickle.dump(explainer, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    r2_storage_client.upload_file(str(local_path), remote_path)
+                except Exception as e:
+                    logger.warning("Failed to persist explainer", model_id=model_id, error=str(e))
+        finally:
+            local_path.unlink(missing_ok=True)
+        
+        return explainer
     
     def generate_explanation(
         self,
         model_id: str,
         method: str = "shap",
-        sample_size: int = 100
+        sample_size: int = 100,
+        num_samples: Optional[int] = None,
+        level: str = "full"
     ) -> Dict[str, Any]:
         """
         Generate explanation for a model using SHAP or LIME.
@@ -37,10 +436,17 @@ class ExplanationService:
             model_id: ID of the trained model
             method: Explanation method ('shap' or 'lime')
             sample_size: Number of samples to use for explanation
+            num_samples: LIME perturbations per instance
+                (defaults to settings.LIME_NUM_SAMPLES)
+            level: 'full' computes SHAP values; 'fast' serves the global
+                importance chart of tree models from ``feature_importances_``
+                without a SHAP pass (other models always run SHAP)
             
         Returns:
             Dictionary with explanation results
         """
+        # Run ID for scratch files, R2 keys and logs; the saved row's ID is
+        # the canonical explanation's
         explanation_id = f"{model_id}_{method}_{uuid.uuid4().hex[:8]}"
         
         try:
@@ -63,69 +469,66 @@ class ExplanationService:
             if not dataset:
                 raise ValueError(f"Dataset {dataset_id} not found")
             
-            # 3. Download model and test data from R2
+            # 3. Model and test data from the local artifact cache (both
+            # fetched from R2 concurrently on first use)
             temp_dir = Path(f"/tmp/{explanation_id}")
             temp_dir.mkdir(parents=True, exist_ok=True)
             
             try:
-                model_path = temp_dir / "model.pkl"
-                test_data_path = temp_dir / "test.parquet"
-                
-                # Download model
-                r2_storage_client.download_file(
-                    model['model_path'],
-                    str(model_path)
-                )
-                
-                # Download test data
-                r2_storage_client.download_file(
-                    f"{dataset['file_path']}/test.parquet",
-                    str(test_data_path)
-                )
+                model_path, test_data_path = _fetch_artifacts(model_id, model, dataset)
                 
                 # Load test data
-                test_df = pd.read_parquet(test_data_path)
+                test_df = _load_test_df(str(test_data_path), test_data_path.stat().st_mtime_ns)
                 
                 # Sample data if needed
                 if len(test_df) > sample_size:
                     test_df = test_df.sample(n=sample_size, random_state=42)
                 
                 # Separate features and target
-                X_test = test_df.iloc[:, :-1]  # All columns except last
+                X_test = _as_float32(test_df.iloc[:, :-1])  # All columns except last
                 y_test = test_df.iloc[:, -1]   # Last column is target
                 
                 # 4. Generate explanation based on method
-                if method.lower() == "shap":
+                if method.lower() == "shap" and level == "fast" and model['model_type'] in _TREE_MODELS:
+                    explanation_data = self._generate_model_importance(model_path, X_test)
+                elif method.lower() == "shap":
                     explanation_data = self._generate_shap(
-                        model_path, X_test, model['model_type']
+                        explanation_id, model_id, model, model_path, X_test, temp_dir
                     )
                 elif method.lower() == "lime":
                     explanation_data = self._generate_lime(
-                        model_path, X_test, model['model_type']
+                        model_path, X_test, model['model_type'],
+                        num_samples=num_samples or settings.LIME_NUM_SAMPLES
                     )
                 else:
                     raise ValueError(f"Unsupported method: {method}")
                 
-                # 5. Save explanation to Supabase
-                explanation_record = {
-                    'id': explanation_id,
-                    'model_id': model_id,
-                    'method': method.lower(),
-                    'status': 'completed',
-                    'num_samples': len(X_test),
-                    'feature_importance': explanation_data.get('feature_importance'),
-                    'explanation_data': explanation_data,
-                    'completed_at': pd.Timestamp.now().isoformat()
-                }
-                
-                supabase_db.create_explanation(explanation_record)
+                # 5. Save explanation to Supabase, replacing the model's
+                # previous global explanation for this method (upsert on
+                # the canonical key; the row keeps its id)
+                saved_id = dal.save_explanation(
+                    model_id,
+                    method.lower(),
+                    {
+                        'status': 'completed',
+                        'error_message': None,
+                        'num_samples': len(X_test),
+                        'feature_importance': explanation_data.get('feature_importance'),
+                        'explanation_data': explanation_data,
+                        'completed_at': pd.Timestamp.now().isoformat()
+                    },
+                    source_module="explanation_service"
+                )
+                if not saved_id:
+                    raise RuntimeError(f"Failed to save explanation for model {model_id}")
                 
                 logger.info("Explanation generated successfully",
-                           explanation_id=explanation_id)
+                           explanation_id=saved_id,
+                           run_id=explanation_id)
                 
                 return {
                     'status': 'success',
-                    'explanation_id': explanation_id,
+                    'explanation_id': saved_id,
                     'method': method,
                     'feature_importance': explanation_data.get('feature_importance')
                 }
@@ -142,15 +545,16 @@ class ExplanationService:
                         error=str(e),
                         exc_info=e)
             
-            # Save error to database
+            # Save error to database (only if the model has no explanation
+            # for this method yet; a failed re-run keeps the previous one)
             try:
-                supabase_db.create_explanation({
-                    'id': explanation_id,
-                    'model_id': model_id,
-                    'method': method.lower(),
-                    'status': 'failed',
-                    'error_message': str(e)
-                })
+                dal.save_explanation(
+                    model_id,
+                    method.lower(),
+                    {'status': 'failed', 'error_message': str(e)},
+                    source_module="explanation_service",
+                    keep_existing=True
+                )
             except:
                 pass
             
@@ -158,47 +562,105 @@ class ExplanationService:
     
     def _generate_shap(
         self,
+        explanation_id: str,
+        model_id: str,
+        model: Dict[str, Any],
         model_path: Path,
         X_test: pd.DataFrame,
-        model_type: str
+        temp_dir: Path
     ) -> Dict[str, Any]:
         """Generate SHAP explanations."""
-        import pickle
-        import shap
-        
         # Load model
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        trained_model = _load_model(model_path)
         
-        # Create explainer
-        if model_type in ['xgboost', 'lightgbm', 'catboost']:
-            explainer = shap.TreeExplainer(model)
-        else:
-            # Use KernelExplainer for other models (slower)
-            background = shap.sample(X_test, min(100, len(X_test)))
-            explainer = shap.KernelExplainer(model.predict_proba, background)
+        explainer = shap_values = None
+        if (
+            len(X_test) > GPU_TREESHAP_MIN_ROWS
+            and _is_tree_model(trained_model, model['model_type'])
+            and _gpu_available()
+        ):
+            # Large batches of tree models run GPUTreeShap; built per call
+            # and never cached, so persisted explainers stay CPU-loadable
+            try:
+                import shap
+                explainer = shap.GPUTreeExplainer(trained_model)
+                shap_values = explainer.shap_values(X_test, check_additivity=False)
+            except Exception as e:
+                # A visible GPU does not mean shap was built with its CUDA
+                # extension (PyPI wheels usually are not)
+                logger.warning("GPUTreeShap failed, falling back to CPU",
+                              model_id=model_id,
+                              error=str(e))
+                explainer = shap_values = None
         
-        # Calculate SHAP values
-        shap_values = explainer.shap_values(X_test)
+        if shap_values is None:
+            # Get explainer (memory cache, then R2, then fit)
+            explainer = self._get_explainer(
+                model_id, model, trained_model, lambda: X_test, temp_dir
+            )
+            
+            # Calculate SHAP values (approximate: only aggregated importances
+            # are shown for global explanations)
+            shap_values = _shap_values(explainer, X_test, approximate=True)
         
         # For binary classification, take positive class
         if isinstance(shap_values, list):
             shap_values = shap_values[1]
         
-        # Calculate feature importance (mean absolute SHAP values)
-        feature_importance = {}
-        for i, col in enumerate(X_test.columns):
-            feature_importance[col] = float(np.abs(shap_values[:, i]).mean())
+        # Calculate feature importance (mean absolute SHAP values), all
+        # columns in one pass over the SHAP matrix
+        importances = np.abs(shap_values).mean(axis=0)
+        feature_importance = dict(zip(X_test.columns, importances.astype(float).tolist()))
         
         # Sort by importance
         feature_importance = dict(
             sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
         )
         
+        base_value = _expected_value(explainer)
+        
+        result = {
+            'feature_importance': feature_importance,
+            'base_value': base_value,
+            'feature_names': list(X_test.columns)
+        }
+        
+        # The raw SHAP matrix goes to R2 as a float32 zstd parquet (one column
+        # per feature); the explanation row only keeps its key
+        shap_df = pd.DataFrame(
+            np.asarray(shap_values, dtype=np.float32), columns=X_test.columns
+        )
+        buffer = io.BytesIO()
+        shap_df.to_parquet(buffer, compression='zstd', index=False)
+        r2_key = f"explanations/{model_id}/{explanation_id}/shap_values.parquet"
+        if r2_storage_client.upload_bytes(buffer.getvalue(), r2_key, content_type='application/vnd.apache.parquet'):
+            result['shap_values_r2_key'] = r2_key
+        else:
+            logger.warning("SHAP matrix not persisted", explanation_id=explanation_id)
+        return result
+    
+    def _generate_model_importance(
+        self,
+        model_path: Path,
+        X_test: pd.DataFrame
+    ) -> Dict[str, Any]:
+        """Global importances from a tree model's ``feature_importances_`` (normalized)."""
+        trained_model = _load_model(model_path)
+        importances = np.asarray(trained_model.feature_importances_, dtype=np.float64)
+        total = importances.sum()
+        if total > 0:
+            importances = importances / total
+        
+        feature_importance = dict(
+            sorted(
+                zip(X_test.columns, importances.tolist()),
+                key=lambda x: x[1], reverse=True
+            )
+        )
+        
         return {
             'feature_importance': feature_importance,
-            'shap_values': shap_values.tolist(),
-            'base_value': float(explainer.expected_value) if hasattr(explainer, 'expected_value') else 0.0,
+            'importance_source': 'model',
             'feature_names': list(X_test.columns)
         }
     
@@ -206,15 +668,14 @@ class ExplanationService:
         self,
         model_path: Path,
         X_test: pd.DataFrame,
-        model_type: str
+        model_type: str,
+        num_samples: int = 1000
     ) -> Dict[str, Any]:
         """Generate LIME explanations."""
-        import pickle
         from lime.lime_tabular import LimeTabularExplainer
         
         # Load model
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        model = _load_model(model_path)
         
         # Create LIME explainer
         explainer = LimeTabularExplainer(
@@ -224,21 +685,29 @@ class ExplanationService:
             mode='classification'
         )
         
-        # Generate explanations for a sample of instances
-        sample_indices = np.random.choice(len(X_test), min(10, len(X_test)), replace=False)
+        # Generate explanations for a sample of instances; a seeded PCG64
+        # stream picks them and derives one independent seed per instance
+        rng = np.random.default_rng(42)
+        sample_indices = rng.choice(len(X_test), size=min(10, len(X_test)), replace=False)
+        instance_seeds = rng.integers(2**31 - 1, size=len(sample_indices))
         
         feature_importance = {}
         explanations = []
         
-        for idx in sample_indices:
-            exp = explainer.explain_instance(
-                X_test.iloc[idx].values,
-                model.predict_proba,
-                num_features=10
+        # Instances are independent; each runs LIME's perturbation sampling
+        # and model calls, so explain them in parallel worker processes
+        from joblib import Parallel, delayed
+        results = Parallel(n_jobs=-1, backend='loky')(
+            delayed(_explain_lime_instance)(
+                explainer, X_test.iloc[idx].values, model.predict_proba, int(idx), 10, num_samples,
+                int(seed)
             )
-            
+            for idx, seed in zip(sample_indices, instance_seeds)
+        )
+        
+        for idx, exp_list in results:
             # Aggregate feature importance
-            for feature, weight in exp.as_list():
+            for feature, weight in exp_list:
                 feature_name = feature.split()[0]  # Extract feature name
                 if feature_name in feature_importance:
                     feature_importance[feature_name] += abs(weight)
@@ -246,8 +715,8 @@ class ExplanationService:
                     feature_importance[feature_name] = abs(weight)
             
             explanations.append({
-                'instance_id': int(idx),
-                'explanation': exp.as_list()
+                'instance_id': idx,
+                'explanation': exp_list
             })
         
         # Normalize feature importance
@@ -286,10 +755,32 @@ class ExplanationService:
         Returns:
             Dictionary with SHAP values, base value, prediction, and feature values
         """
+        return self.generate_local_explanations_batch(model_id, [sample_index], method)[0]
+    
+    def generate_local_explanations_batch(
+        self,
+        model_id: str,
+        sample_indices: List[int],
+        method: str = "shap"
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate local explanations for several samples at once.
+        
+        The model and test data are fetched once, and SHAP values and
+        predictions for all samples come from a single batched call each.
+        
+        Args:
+            model_id: ID of the trained model
+            sample_indices: Indices of the samples in test set
+            method: Explanation method ('shap' only for now)
+            
+        Returns:
+            One local explanation dictionary per sample, in request order
+        """
         try:
-            logger.info("Generating local explanation",
+            logger.info("Generating local explanations",
                        model_id=model_id,
-                       sample_index=sample_index)
+                       sample_indices=sample_indices)
             
             # 1. Get model from database
             model = supabase_db.get_model(model_id)
@@ -302,112 +793,67 @@ class ExplanationService:
             if not dataset:
                 raise ValueError(f"Dataset {dataset_id} not found")
             
-            # 3. Download model and test data from R2
-            temp_dir = Path(f"/tmp/local_exp_{model_id}_{sample_index}")
-            temp_dir.mkdir(parents=True, exist_ok=True)
+            # 3. Model and test data from the local artifact cache (both
+            # fetched from R2 concurrently on first use)
+            model_path, test_data_path = _fetch_artifacts(model_id, model, dataset)
             
-            try:
-                model_path = temp_dir / "model.pkl"
-                test_data_path = temp_dir / "test.parquet"
-                
-                # Download model
-                r2_storage_client.download_file(
-                    model['model_path'],
-                    str(model_path)
-                )
-                
-                # Download test data
-                r2_storage_client.download_file(
-                    f"{dataset['file_path']}/test.parquet",
-                    str(test_data_path)
-                )
-                
-                # Load test data
-                test_df = pd.read_parquet(test_data_path)
-                
-                # Validate sample index
-                if sample_index < 0 or sample_index >= len(test_df):
-                    raise ValueError(f"Sample index {sample_index} out of range [0, {len(test_df)-1}]")
-                
-                # Separate features and target
-                X_test = test_df.iloc[:, :-1]
-                y_test = test_df.iloc[:, -1]
-                
-                # Get the specific sample
-                x_sample = X_test.iloc[sample_index:sample_index+1]
-                y_true = int(y_test.iloc[sample_index])
-                
-                # 4. Load model and create explainer
-                import pickle
-                import shap
-                
-                with open(model_path, 'rb') as f:
-                    trained_model = pickle.load(f)
-                
-                # Get prediction
-                y_pred_proba = trained_model.predict_proba(x_sample)[0]
-                y_pred = int(trained_model.predict(x_sample)[0])
-                
-                # Create explainer (use cache if available)
-                cache_key = f"{model_id}_{model['model_type']}"
-                if cache_key not in self._explainer_cache:
-                    if model['model_type'] in ['xgboost', 'random_forest']:
-                        explainer = shap.TreeExplainer(trained_model)
-                    else:
-                        background = shap.sample(X_test, min(50, len(X_test)))
-                        explainer = shap.KernelExplainer(trained_model.predict_proba, background)
-                    
-                    self._explainer_cache[cache_key] = explainer
-                else:
-                    explainer = self._explainer_cache[cache_key]
-                
-                # Calculate SHAP values for this single sample
-                shap_values = explainer.shap_values(x_sample)
-                
-                # For binary classification, take positive class
-                if isinstance(shap_values, list):
-                    shap_values = shap_values[1]
-                
-                # Get base value (expected value)
-                if hasattr(explainer, 'expected_value'):
-                    base_value = float(explainer.expected_value)
-                    if isinstance(explainer.expected_value, (list, np.ndarray)):
-                        base_value = float(explainer.expected_value[1])
-                else:
-                    base_value = 0.0
-                
-                # Format for force plot
-                feature_values = x_sample.iloc[0].to_dict()
-                shap_dict = {
-                    col: float(shap_values[0, i])
-                    for i, col in enumerate(x_sample.columns)
-                }
-                
-                return {
+            # Read (and validate) only the requested rows; the full split is
+            # only parsed if a KernelExplainer has to be fitted
+            sample_df = _read_test_rows(test_data_path, sample_indices)
+            X_batch = _as_float32(sample_df.iloc[:, :-1])
+            y_true = sample_df.iloc[:, -1].astype(int).tolist()
+            
+            def load_X_test() -> pd.DataFrame:
+                test_df = _load_test_df(str(test_data_path), test_data_path.stat().st_mtime_ns)
+                return _as_float32(test_df.iloc[:, :-1])
+            
+            # 4. Load model and create explainer
+            trained_model = _load_model(model_path)
+            
+            # Get predictions for the whole batch
+            y_pred_proba = trained_model.predict_proba(X_batch)
+            y_pred = trained_model.predict(X_batch)
+            
+            # Get explainer (memory cache, then R2, then fit)
+            explainer = self._get_explainer(model_id, model, trained_model, load_X_test, model_path.parent)
+            
+            # Calculate SHAP values for all samples in one call
+            shap_values = _shap_values(explainer, X_batch)
+            
+            # For binary classification, take positive class
+            if isinstance(shap_values, list):
+                shap_values = shap_values[1]
+            
+            # Get base value (expected value)
+            base_value = _expected_value(explainer)
+            
+            # Format for force plot, one entry per sample
+            feature_names = list(X_batch.columns)
+            feature_rows = X_batch.to_dict(orient='records')
+            results = []
+            for row, sample_index in enumerate(sample_indices):
+                results.append({
                     'sample_index': sample_index,
-                    'feature_values': feature_values,
-                    'shap_values': shap_dict,
+                    'feature_values': feature_rows[row],
+                    'shap_values': dict(zip(feature_names, shap_values[row].astype(float).tolist())),
                     'base_value': base_value,
                     'prediction': {
-                        'class': y_pred,
-                        'probability': float(y_pred_proba[1]),  # Probability of positive class
-                        'probabilities': [float(p) for p in y_pred_proba]
+                        'class': int(y_pred[row]),
+                        'probability': float(y_pred_proba[row][1]),  # Probability of positive class
+                        'probabilities': [float(p) for p in y_pred_proba[row]]
                     },
-                    'true_label': y_true,
-                    'feature_names': list(x_sample.columns),
+                    'true_label': y_true[row],
+                    'feature_names': feature_names,
                     'method': 'shap'
-                }
-                
-            finally:
-                # Cleanup
-                import shutil
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
+                })
+            
+            return results
+            
         
         except Exception as e:
             logger.error("Local explanation generation failed",
                         model_id=model_id,
-                        sample_index=sample_index,
+                        sample_indices=sample_indices,
                         error=str(e),
                         exc_info=e)
             raise
@@ -6,26 +6,235 @@ Supports two paradigms:
 2. Rule-based scientific interpretation (deterministic SHAP reasoning)
 """
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import heapq
+from functools import cached_property, lru_cache
+from typing import Dict, Any, Final, Iterator, List, Optional, Tuple
+from importlib.util import find_spec
+import numpy as np
 import structlog
-from openai import OpenAI
 
 from app.core.config import settings
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# httpx only speaks HTTP/2 with the optional h2 package installed
+H2_AVAILABLE = find_spec("h2") is not None
+
+# LLM responses are cached on disk when diskcache is installed
+DISKCACHE_AVAILABLE = find_spec("diskcache") is not None
+
+LLM_MODEL = "gpt-4-turbo-preview"
+
+_SYSTEM_PROMPT: Final[str] = """You are a financial AI expert explaining loan approval decisions to loan officers and applicants.
+
+Your task is to translate SHAP (SHapley Additive exPlanations) values into clear, human-understandable reasoning about why a loan application was approved or denied.
+
+Guidelines:
+1. Use plain language, avoid technical jargon
+2. Focus on the top 3-5 most important factors
+3. Explain both risk-increasing and risk-decreasing factors
+4. Provide actionable insights when possible
+5. Be empathetic but factual
+6. Structure your explanation clearly with sections
+
+Context: This is for the Home Credit Default Risk dataset, predicting loan default probability."""
+
+_USER_PROMPT_TEMPLATE: Final[str] = """Please explain this loan decision:
+
+**Prediction:** {risk_label}
+**Confidence:** {confidence:.1f}%
+
+**SHAP Feature Contributions:**
+{features}
+
+Generate a clear, empathetic explanation that:
+1. States the decision and confidence level
+2. Explains the top 3-5 key factors
+3. Provides a summary of the overall reasoning
+4. Uses markdown formatting for readability"""
+
+# SHA-256 state over the static part of the LLM cache key; each request
+# copies it and feeds in only its user prompt
+_LLM_CACHE_KEY_PREFIX = hashlib.sha256(f"{LLM_MODEL}||{_SYSTEM_PROMPT}||".encode("utf-8"))
+
+
+# |contribution| thresholds between "slightly", "moderately" and "strongly"
+_STRENGTH_BINS = np.array([0.15, 0.3])
+_STRENGTHS = np.array(["slightly", "moderately", "strongly"])
+
+
+@lru_cache(maxsize=2048)
+def _rule_based_text(features_key: Tuple[Tuple[str, str, float], ...], prediction_proba: float) -> str:
+    """
+    Build the rule-based interpretation text (memoized).
+    
+    Args:
+        features_key: (feature name, value as text, contribution) of the top
+            features, most important first
+        prediction_proba: Predicted probability of the positive class
+        
+    Returns:
+        Markdown interpretation text
+    """
+    opening = _opening(prediction_proba)
+    
+    # Strength and direction of every top feature in one vectorized pass
+    # (right=True: a value exactly on a threshold falls in the weaker bin)
+    contributions = np.fromiter((f[2] for f in features_key), dtype=np.float64, count=len(features_key))
+    strength_codes = np.digitize(np.abs(contributions), _STRENGTH_BINS, right=True)
+    
+    return _assemble_text(
+        opening,
+        [(name, value) for name, value, _ in features_key],
+        strength_codes,
+        contributions
+    )
+
+
+def _assemble_text(
+    opening: str,
+    features: List[Tuple[str, str]],
+    strength_codes: np.ndarray,
+    contributions: np.ndarray
+) -> str:
+    """
+    Join the opening, one line per feature and the summary.
+    
+    Args:
+        opening: Opening statement
+        features: (feature name, value as text), most important first
+        strength_codes: Index into ``_STRENGTHS`` per feature
+        contributions: SHAP contribution per feature
+        
+    Returns:
+        Markdown interpretation text
+    """
+    strengths = _STRENGTHS[strength_codes]
+    increases = contributions > 0
+    
+    # One line per top feature
+    feature_lines = [
+        f"{i}. **{feature_name}** (value: {value}): "
+        f"This {strength} {'increases' if increase else 'decreases'} the risk. "
+        f"The current value makes the applicant appear more {'risky' if increase else 'safe'}."
+        for i, ((feature_name, value), strength, increase) in enumerate(
+            zip(features, strengths.tolist(), increases.tolist()), 1
+        )
+    ]
+    
+    # Summary
+    n_positive = int(increases.sum())
+    n_negative = int((contributions < 0).sum())
+    if n_positive > n_negative:
+        summary = (
+            f"The decision is primarily driven by {n_positive} risk-increasing factors, "
+            f"which outweigh the {n_negative} protective factors."
+        )
+    elif n_negative > n_positive:
+        summary = (
+            f"The decision is primarily driven by {n_negative} protective factors, "
+            f"which outweigh the {n_positive} risk-increasing factors."
+        )
+    else:
+        summary = "The decision reflects a balance between risk-increasing and protective factors."
+    
+    return "\n".join([opening, "\n**Key Factors:**\n", *feature_lines, "\n**Summary:**", summary])
+
+
+def _opening(prediction_proba: float) -> str:
+    """Opening statement for a predicted probability."""
+    if prediction_proba > 0.5:
+        return f"The model predicts **HIGH RISK** with {prediction_proba*100:.1f}% confidence."
+    return f"The model predicts **LOW RISK** with {(1-prediction_proba)*100:.1f}% confidence."
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _top_effects_numba(contributions, k):
+        n_rows, n_features = contributions.shape
+        k = min(k, n_features)
+        top_idx = np.empty((n_rows, k), dtype=np.int64)
+        strength_codes = np.empty((n_rows, k), dtype=np.int64)
+        for i in prange(n_rows):
+            magnitudes = np.abs(contributions[i])
+            taken = np.zeros(n_features, dtype=np.bool_)
+            # Partial selection: k passes, each picking the largest remaining
+            # magnitude (first index wins ties, like heapq.nlargest)
+            for j in range(k):
+                best = -1
+                for f in range(n_features):
+                    if not taken[f] and (best == -1 or magnitudes[f] > magnitudes[best]):
+                        best = f
+                taken[best] = True
+                top_idx[i, j] = best
+                a = magnitudes[best]
+                strength_codes[i, j] = 2 if a > 0.3 else (1 if a > 0.15 else 0)
+        return top_idx, strength_codes
+
+
+def _top_effects(contributions: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-``k`` features by |contribution| per row, with their strength codes.
+    
+    Uses a parallel numba kernel when numba is installed.
+    
+    Args:
+        contributions: SHAP matrix (applicants x features)
+        k: Features to keep per applicant
+        
+    Returns:
+        Tuple of (feature indices, strength codes), both (applicants x k),
+        most important first
+    """
+    contributions = np.ascontiguousarray(contributions, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _top_effects_numba(contributions, k)
+    top_idx = np.argsort(-np.abs(contributions), axis=1, kind='stable')[:, :k]
+    top_abs = np.abs(np.take_along_axis(contributions, top_idx, axis=1))
+    return top_idx, np.digitize(top_abs, _STRENGTH_BINS, right=True)
+
 
 class InterpretationService:
     """Service for generating human-readable interpretations from SHAP values."""
     
-    def __init__(self):
-        """Initialize interpretation service with OpenAI client."""
-        self.openai_client = None
-        if settings.OPENAI_API_KEY:
-            self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            logger.info("OpenAI client initialized")
-        else:
+    @cached_property
+    def openai_client(self):
+        """
+        OpenAI client, created on first LLM request (None without an API key).
+        
+        Uses one pooled httpx client (HTTP/2 when ``h2`` is installed) so
+        LLM calls reuse their connection instead of re-handshaking.
+        """
+        if not settings.OPENAI_API_KEY:
             logger.warning("OpenAI API key not configured")
+            return None
+        
+        import httpx
+        from openai import OpenAI
+        
+        http_client = httpx.Client(
+            http2=H2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        client = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+        logger.info("OpenAI client initialized", http2=H2_AVAILABLE)
+        return client
+    
+    @cached_property
+    def _llm_cache(self):
+        """Disk cache of LLM interpretations (None if diskcache is not installed)."""
+        if not DISKCACHE_AVAILABLE:
+            return None
+        import diskcache
+        return diskcache.Cache(settings.LLM_CACHE_DIR)
     
     def generate_interpretation(
         self,
@@ -53,6 +262,57 @@ class InterpretationService:
             logger.error("Failed to generate interpretation", mode=mode, error=str(e))
             raise
     
+    def batch_interpret(
+        self,
+        shap_matrix: np.ndarray,
+        feature_names: List[str],
+        prediction_probas: List[float],
+        feature_values: Optional[np.ndarray] = None,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Rule-based interpretations for many applicants at once.
+        
+        Top-k selection and strength classification run in one kernel over
+        the whole SHAP matrix; only the text assembly is per applicant.
+        
+        Args:
+            shap_matrix: SHAP values (applicants x features)
+            feature_names: Feature names, matching the matrix columns
+            prediction_probas: Predicted probability per applicant
+            feature_values: Optional feature values (applicants x features)
+            top_k: Features explained per applicant
+            
+        Returns:
+            One rule-based interpretation dictionary per applicant
+        """
+        shap_matrix = np.asarray(shap_matrix, dtype=np.float64)
+        top_idx, strength_codes = _top_effects(shap_matrix, top_k)
+        
+        results = []
+        for row, prediction_proba in enumerate(prediction_probas):
+            idx = top_idx[row]
+            names = [feature_names[j] for j in idx.tolist()]
+            if feature_values is not None:
+                values = [str(v) for v in np.asarray(feature_values[row])[idx].tolist()]
+            else:
+                values = ['N/A'] * len(names)
+            
+            results.append({
+                "mode": "rule-based",
+                "interpretation": _assemble_text(
+                    _opening(prediction_proba),
+                    list(zip(names, values)),
+                    strength_codes[row],
+                    shap_matrix[row, idx]
+                ),
+                "top_features": names,
+                "confidence": prediction_proba,
+                "prediction": int(prediction_proba > 0.5),
+                "method": "Deterministic SHAP reasoning"
+            })
+        return results
+    
     def _generate_rule_based_interpretation(
         self,
         shap_data: Dict[str, Any],
@@ -70,85 +330,17 @@ class InterpretationService:
         prediction = shap_data.get('prediction', 'Unknown')
         prediction_proba = shap_data.get('prediction_proba', 0.5)
         
-        # Sort features by absolute importance
-        sorted_features = sorted(
-            features,
-            key=lambda x: abs(x.get('contribution', 0)),
-            reverse=True
-        )
-        
-        # Take top 5 most important features
-        top_features = sorted_features[:5]
-        
-        # Build interpretation
-        interpretation_parts = []
-        
-        # Opening statement
-        if prediction_proba > 0.5:
-            interpretation_parts.append(
-                f"The model predicts **HIGH RISK** with {prediction_proba*100:.1f}% confidence."
-            )
-        else:
-            interpretation_parts.append(
-                f"The model predicts **LOW RISK** with {(1-prediction_proba)*100:.1f}% confidence."
-            )
-        
-        interpretation_parts.append("\n**Key Factors:**\n")
-        
-        # Analyze each top feature
-        for i, feature in enumerate(top_features, 1):
-            feature_name = feature.get('feature', 'Unknown')
-            contribution = feature.get('contribution', 0)
-            value = feature.get('value', 'N/A')
-            
-            # Determine effect strength
-            abs_contrib = abs(contribution)
-            if abs_contrib > 0.3:
-                strength = "strongly"
-            elif abs_contrib > 0.15:
-                strength = "moderately"
-            else:
-                strength = "slightly"
-            
-            # Determine direction
-            if contribution > 0:
-                direction = "increases"
-                impact = "risky"
-            else:
-                direction = "decreases"
-                impact = "safe"
-            
-            # Build feature explanation
-            feature_text = (
-                f"{i}. **{feature_name}** (value: {value}): "
-                f"This {strength} {direction} the risk. "
-                f"The current value makes the applicant appear more {impact}."
-            )
-            
-            interpretation_parts.append(feature_text)
-        
-        # Summary
-        interpretation_parts.append("\n**Summary:**")
-        
-        positive_features = [f for f in top_features if f.get('contribution', 0) > 0]
-        negative_features = [f for f in top_features if f.get('contribution', 0) < 0]
+        # Top 5 most important features by absolute contribution (bounded
+        # heap, no full sort)
+        top_features = heapq.nlargest(5, features, key=lambda x: abs(x.get('contribution', 0)))
         
-        if len(positive_features) > len(negative_features):
-            interpretation_parts.append(
-                f"The decision is primarily driven by {len(positive_features)} risk-increasing factors, "
-                f"which outweigh the {len(negative_features)} protective factors."
-            )
-        elif len(negative_features) > len(positive_features):
-            interpretation_parts.append(
-                f"The decision is primarily driven by {len(negative_features)} protective factors, "
-                f"which outweigh the {len(positive_features)} risk-increasing factors."
-            )
-        else:
-            interpretation_parts.append(
-                "The decision reflects a balance between risk-increasing and protective factors."
-            )
-        
-        interpretation_text = "\n".join(interpretation_parts)
+        # The text depends only on the top features and the probability, so
+        # repeated requests for the same explanation reuse the built string
+        features_key = tuple(
+            (f.get('feature', 'Unknown'), str(f.get('value', 'N/A')), f.get('contribution', 0))
+            for f in top_features
+        )
+        interpretation_text = _rule_based_text(features_key, prediction_proba)
         
         return {
             "mode": "rule-based",
@@ -173,62 +365,29 @@ class InterpretationService:
         if not self.openai_client:
             raise ValueError("OpenAI API key not configured")
         
-        features = shap_data.get('features', [])
         prediction = shap_data.get('prediction', 'Unknown')
         prediction_proba = shap_data.get('prediction_proba', 0.5)
+        feature_summary, user_prompt, cache_key = self._build_llm_prompt(shap_data)
         
-        # Sort features by absolute importance
-        sorted_features = sorted(
-            features,
-            key=lambda x: abs(x.get('contribution', 0)),
-            reverse=True
-        )[:5]
-        
-        # Build feature summary for LLM
-        feature_summary = []
-        for f in sorted_features:
-            feature_summary.append({
-                "feature": f.get('feature'),
-                "value": f.get('value'),
-                "contribution": f.get('contribution'),
-                "effect": "increases risk" if f.get('contribution', 0) > 0 else "decreases risk"
-            })
+        # Identical prompts get the stored interpretation instead of a new
+        # GPT-4 call
+        cached_text = self._llm_cache.get(cache_key) if self._llm_cache is not None else None
+        if cached_text is not None:
+            return {
+                "mode": "llm",
+                "interpretation": cached_text,
+                "top_features": [f['feature'] for f in feature_summary],
+                "confidence": prediction_proba,
+                "prediction": prediction,
+                "method": "GPT-4 Turbo (cached)",
+                "tokens_used": 0
+            }
         
-        # System prompt
-        system_prompt = """You are a financial AI expert explaining loan approval decisions to loan officers and applicants.
-
-Your task is to translate SHAP (SHapley Additive exPlanations) values into clear, human-understandable reasoning about why a loan application was approved or denied.
-
-Guidelines:
-1. Use plain language, avoid technical jargon
-2. Focus on the top 3-5 most important factors
-3. Explain both risk-increasing and risk-decreasing factors
-4. Provide actionable insights when possible
-5. Be empathetic but factual
-6. Structure your explanation clearly with sections
-
-Context: This is for the Home Credit Default Risk dataset, predicting loan default probability."""
-
-        # User prompt with SHAP data
-        user_prompt = f"""Please explain this loan decision:
-
-**Prediction:** {"HIGH RISK (Likely to Default)" if prediction_proba > 0.5 else "LOW RISK (Unlikely to Default)"}
-**Confidence:** {prediction_proba*100:.1f}%
-
-**SHAP Feature Contributions:**
-{self._format_features_for_llm(feature_summary)}
-
-Generate a clear, empathetic explanation that:
-1. States the decision and confidence level
-2. Explains the top 3-5 key factors
-3. Provides a summary of the overall reasoning
-4. Uses markdown formatting for readability"""
-
         try:
             response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+                model=LLM_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.7,
@@ -236,6 +395,10 @@ Generate a clear, empathetic explanation that:
             )
             
             interpretation_text = response.choices[0].message.content
+            if self._llm_cache is not None and interpretation_text:
+                self._llm_cache.set(
+                    cache_key, interpretation_text, expire=settings.LLM_CACHE_TTL_SECONDS
+                )
             
             return {
                 "mode": "llm",
@@ -251,6 +414,93 @@ Generate a clear, empathetic explanation that:
             logger.error("OpenAI API call failed", error=str(e))
             raise
     
+    def _build_llm_prompt(self, shap_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str, str]:
+        """
+        Build the user prompt for an explanation.
+        
+        Returns:
+            Tuple of (top feature summary, user prompt, LLM cache key)
+        """
+        features = shap_data.get('features', [])
+        prediction_proba = shap_data.get('prediction_proba', 0.5)
+        
+        # Top 5 most important features by absolute contribution
+        sorted_features = heapq.nlargest(5, features, key=lambda x: abs(x.get('contribution', 0)))
+        
+        # Build feature summary for LLM
+        feature_summary = []
+        for f in sorted_features:
+            feature_summary.append({
+                "feature": f.get('feature'),
+                "value": f.get('value'),
+                "contribution": f.get('contribution'),
+                "effect": "increases risk" if f.get('contribution', 0) > 0 else "decreases risk"
+            })
+        
+        # User prompt with SHAP data
+        user_prompt = _USER_PROMPT_TEMPLATE.format_map({
+            "risk_label": (
+                "HIGH RISK (Likely to Default)" if prediction_proba > 0.5
+                else "LOW RISK (Unlikely to Default)"
+            ),
+            "confidence": prediction_proba * 100,
+            "features": self._format_features_for_llm(feature_summary),
+        })
+        
+        # Cache key: static prefix state plus this user prompt
+        cache_hash = _LLM_CACHE_KEY_PREFIX.copy()
+        cache_hash.update(user_prompt.encode("utf-8"))
+        cache_key = cache_hash.hexdigest()
+        return feature_summary, user_prompt, cache_key
+    
+    def generate_interpretation_stream(self, shap_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream an LLM interpretation as it is generated.
+        
+        Yields text fragments as GPT-4 produces them (a cached
+        interpretation is yielded in one piece). The full text is cached
+        afterwards, so later non-streaming requests for it are hits.
+        
+        Args:
+            shap_data: SHAP explanation data with feature contributions
+            
+        Yields:
+            Interpretation text fragments
+        """
+        if not self.openai_client:
+            raise ValueError("OpenAI API key not configured")
+        
+        _, user_prompt, cache_key = self._build_llm_prompt(shap_data)
+        cached_text = self._llm_cache.get(cache_key) if self._llm_cache is not None else None
+        if cached_text is not None:
+            yield cached_text
+            return
+        
+        stream = self.openai_client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=800,
+            stream=True
+        )
+        
+        fragments = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            fragment = chunk.choices[0].delta.content or ""
+            if fragment:
+                fragments.append(fragment)
+                yield fragment
+        
+        if self._llm_cache is not None and fragments:
+            self._llm_cache.set(
+                cache_key, "".join(fragments), expire=settings.LLM_CACHE_TTL_SECONDS
+            )
+    
     def _format_features_for_llm(self, features: List[Dict[str, Any]]) -> str:
         """Format feature data for LLM prompt."""
         lines = []
@@ -4,18 +4,23 @@ Downloads and processes Home Credit Default Risk dataset.
 """
 
 import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import structlog
-from typing import Dict, Any, Tuple
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from typing import Dict, Any, Optional, Tuple
 
+from app.core.config import settings
 from app.services.r2_service import r2_service
+from app.utils.kaggle_client import get_kaggle_api
 
 logger = structlog.get_logger()
 
+# Numeric columns summarized in the EDA statistics
+EDA_MAX_COLUMNS = 10
+
 
 class KaggleService:
     """Service for Kaggle dataset operations"""
@@ -23,36 +28,59 @@ class KaggleService:
     DATASET_NAME = "c/home-credit-default-risk"
     DATA_DIR = Path("data/raw/home_credit")
     PROCESSED_DIR = Path("data/processed")
+    PROCESSED_R2_PREFIX = "datasets/home-credit-default-risk/processed"
     
     def __init__(self):
         self.DATA_DIR.mkdir(parents=True, exist_ok=True)
         self.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+        # Background R2 uploads, overlapped with the remaining preprocessing
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+    
+    def shutdown(self) -> None:
+        """Wait for pending R2 uploads and stop the upload threads."""
+        self._io_pool.shutdown(wait=True)
+    
+    def _upload_processed(self, local_path: Path) -> Optional[Future]:
+        """Start uploading a processed file to R2; None if R2 is not configured."""
+        if not r2_service.is_configured():
+            return None
+        return self._io_pool.submit(
+            r2_service.upload_file, local_path, f"{self.PROCESSED_R2_PREFIX}/{local_path.name}"
+        )
     
     def download_dataset(self) -> Dict[str, Any]:
         """Download Home Credit dataset from Kaggle"""
         try:
             logger.info("Downloading Home Credit dataset from Kaggle")
             
-            # Check if kaggle is configured
-            if not os.path.exists(os.path.expanduser('~/.kaggle/kaggle.json')):
+            # Check if kaggle is configured (kaggle.json or environment credentials)
+            has_env_credentials = bool(
+                (os.getenv('KAGGLE_USERNAME') or settings.KAGGLE_USERNAME)
+                and (os.getenv('KAGGLE_KEY') or settings.KAGGLE_KEY)
+            )
+            if not has_env_credentials and not os.path.exists(os.path.expanduser('~/.kaggle/kaggle.json')):
                 raise Exception("Kaggle API not configured. Please set up ~/.kaggle/kaggle.json")
             
-            import kaggle
-            
             # Download using Kaggle API
-            kaggle.api.competition_download_files(
+            get_kaggle_api().competition_download_files(
                 'home-credit-default-risk',
                 path=str(self.DATA_DIR),
                 quiet=False
             )
             
-            # Unzip files
+            # Unzip files: members are streamed straight to their final path,
+            # several at once (zlib releases the GIL while decompressing)
             import zipfile
             zip_path = self.DATA_DIR / "home-credit-default-risk.zip"
             
             if zip_path.exists():
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(self.DATA_DIR)
+                with zipfile.ZipFile(zip_path, 'r', allowZip64=True) as zip_ref:
+                    members = [m for m in zip_ref.infolist() if not m.is_dir()]
+                    with ThreadPoolExecutor(max_workers=4) as executor:
+                        list(executor.map(
+                            lambda member: self._extract_member(zip_ref, member, self.DATA_DIR),
+                            members
+                        ))
                 zip_path.unlink()  # Delete zip after extraction
             
             logger.info("Dataset downloaded successfully")
@@ -75,8 +103,28 @@ class KaggleService:
             logger.error("Failed to download dataset", error=str(e))
             raise
     
-    def load_and_preprocess(self) -> Dict[str, Any]:
-        """Load and preprocess the main application_train.csv file"""
+    @staticmethod
+    def _extract_member(zip_ref, member, target_dir: Path) -> Path:
+        """Stream one zip member to ``target_dir`` in 1 MiB chunks."""
+        target_path = target_dir / Path(member.filename).name
+        with zip_ref.open(member) as src, open(target_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, length=1 << 20)
+        return target_path
+    
+    def load_and_preprocess(self, scale: bool = False) -> Dict[str, Any]:
+        """
+        Load and preprocess the main application_train.csv file.
+        
+        Args:
+            scale: Standardize all features (numeric and encoded categorical).
+                Off by default: the tree models trained on this dataset are
+                invariant to feature scaling.
+        """
+        from sklearn.compose import ColumnTransformer
+        from sklearn.model_selection import train_test_split
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import OrdinalEncoder, StandardScaler
+        
         try:
             logger.info("Loading application_train.csv")
             
@@ -94,7 +142,9 @@ class KaggleService:
                 else:
                     raise FileNotFoundError(f"application_train.csv not found. Please download dataset first.")
             
-            df = pd.read_csv(train_path)
+            # Multi-threaded Arrow CSV parser (string columns still come
+            # back as object dtype, so the steps below are unchanged)
+            df = pd.read_csv(train_path, engine='pyarrow')
             
             logger.info("Dataset loaded", 
                        n_samples=len(df), 
@@ -111,30 +161,51 @@ class KaggleService:
             if 'SK_ID_CURR' in df.columns:
                 df = df.drop('SK_ID_CURR', axis=1)
             
-            # 3. Handle missing values
+            # 3. Handle missing values in one fillna pass
             # For numerical: fill with median
             numerical_cols = df.select_dtypes(include=[np.number]).columns
-            for col in numerical_cols:
-                df[col].fillna(df[col].median(), inplace=True)
+            num_medians = df[numerical_cols].median()
             
-            # For categorical: fill with mode
+            # For categorical: fill with mode ('UNKNOWN' for all-missing
+            # columns); modes only for the columns that actually have nulls
             categorical_cols = df.select_dtypes(include=['object']).columns
-            for col in categorical_cols:
-                if len(df[col].mode()) > 0:
-                    df[col].fillna(df[col].mode()[0], inplace=True)
-                else:
-                    df[col].fillna('UNKNOWN', inplace=True)
+            cat_cols_with_nulls = categorical_cols[df[categorical_cols].isna().any().to_numpy()]
+            if len(cat_cols_with_nulls) > 0:
+                cat_modes = df[cat_cols_with_nulls].mode().iloc[0].fillna('UNKNOWN')
+            else:
+                cat_modes = pd.Series(dtype=object)
             
-            # 4. Encode categorical variables
-            label_encoders = {}
-            for col in categorical_cols:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
-                label_encoders[col] = le
+            df = df.fillna({**num_medians.to_dict(), **cat_modes.to_dict()})
             
-            # 5. Feature scaling
-            scaler = StandardScaler()
-            df[numerical_cols] = scaler.fit_transform(df[numerical_cols])
+            # 4-5. Encode categoricals (sorted ordinal codes, as LabelEncoder
+            # assigned them; unseen values map to -1) and optionally
+            # standardize, in one fitted ColumnTransformer that is saved so
+            # inference can transform new rows with a single call
+            df[categorical_cols] = df[categorical_cols].astype(str)
+            encoder = OrdinalEncoder(
+                handle_unknown='use_encoded_value', unknown_value=-1, dtype=np.int64
+            )
+            if scale:
+                # Encoded categoricals are scaled too; numeric block as float32
+                df[numerical_cols] = df[numerical_cols].astype(np.float32)
+                cat_step = make_pipeline(encoder, StandardScaler())
+                num_step = StandardScaler(copy=False)
+            else:
+                cat_step, num_step = encoder, 'passthrough'
+            
+            preprocessor = ColumnTransformer(
+                [
+                    ("cat", cat_step, list(categorical_cols)),
+                    ("num", num_step, list(numerical_cols)),
+                ],
+                verbose_feature_names_out=False
+            ).set_output(transform="pandas")
+            feature_order = list(df.columns)
+            df = preprocessor.fit_transform(df)[feature_order]
+            
+            preprocessor_path = self.PROCESSED_DIR / "preprocessor.pkl"
+            pd.to_pickle(preprocessor, preprocessor_path)
+            upload_futures = [self._upload_processed(preprocessor_path)]
             
             # 6. Train/validation/test split
             X_train, X_temp, y_train, y_temp = train_test_split(
@@ -145,41 +216,61 @@ class KaggleService:
                 X_temp, y_temp, test_size=0.5, random_state=42, stratify=y_temp
             )
             
-            # 7. Save processed data (both CSV and Parquet for compatibility)
-            train_df = X_train.copy()
-            train_df['TARGET'] = y_train
-            train_df.to_csv(self.PROCESSED_DIR / "home_credit_train.csv", index=False)
-            train_df.to_parquet(self.PROCESSED_DIR / "train.parquet", index=False)  # For model training
-            
-            val_df = X_val.copy()
-            val_df['TARGET'] = y_val
-            val_df.to_csv(self.PROCESSED_DIR / "home_credit_val.csv", index=False)
-            val_df.to_parquet(self.PROCESSED_DIR / "val.parquet", index=False)  # For model training
-            
-            test_df = X_test.copy()
-            test_df['TARGET'] = y_test
-            test_df.to_csv(self.PROCESSED_DIR / "home_credit_test.csv", index=False)
-            test_df.to_parquet(self.PROCESSED_DIR / "test.parquet", index=False)  # For model training
+            # 7. Save processed data as zstd Parquet (CSV copies only for
+            # legacy consumers, behind settings.WRITE_PROCESSED_CSV)
+            splits = {
+                "train": (X_train, y_train),
+                "val": (X_val, y_val),
+                "test": (X_test, y_test),
+            }
+            for split_name, (X_split, y_split) in splits.items():
+                # Target appended without deep-copying the feature block
+                split_df = pd.concat([X_split, y_split.rename('TARGET')], axis=1, copy=False)
+                parquet_path = self.PROCESSED_DIR / f"{split_name}.parquet"  # For model training
+                split_df.to_parquet(
+                    parquet_path,
+                    engine='pyarrow',
+                    compression='zstd',
+                    row_group_size=64_000,
+                    index=False
+                )
+                upload_futures.append(self._upload_processed(parquet_path))
+                if settings.WRITE_PROCESSED_CSV:
+                    csv_path = self.PROCESSED_DIR / f"home_credit_{split_name}.csv"
+                    split_df.to_csv(csv_path, index=False)
+                    upload_futures.append(self._upload_processed(csv_path))
+                del split_df
             
             logger.info("Preprocessing complete",
                        train_size=len(X_train),
                        val_size=len(X_val),
                        test_size=len(X_test))
             
-            # Upload processed files to R2 for persistent storage
-            if r2_service.is_configured():
-                logger.info("Uploading processed files to R2")
-                r2_service.upload_directory(self.PROCESSED_DIR, "datasets/home-credit-default-risk/processed")
-                logger.info("Processed files uploaded to R2")
+            # Generate EDA statistics (while the R2 uploads run) on just the
+            # columns they use, releasing the full frame and the temporary split
+            n_samples, n_features = df.shape
+            eda_input = df[df.select_dtypes(include=[np.number]).columns[:EDA_MAX_COLUMNS]].copy()
+            del df, X_temp
+            eda_stats = self._generate_eda_stats(eda_input, target)
             
-            # Generate EDA statistics
-            eda_stats = self._generate_eda_stats(df, target)
+            # Processed files must be persisted before reporting success
+            upload_futures = [f for f in upload_futures if f is not None]
+            if upload_futures:
+                uploaded = sum(bool(f.result()) for f in upload_futures)
+                logger.info("Processed files uploaded to R2",
+                           uploaded=uploaded,
+                           total=len(upload_futures))
+                if uploaded < len(upload_futures):
+                    raise RuntimeError(
+                        f"Failed to upload {len(upload_futures) - uploaded} of "
+                        f"{len(upload_futures)} processed files to R2"
+                    )
             
             return {
                 "status": "success",
                 "dataset_id": "home-credit-default-risk",
-                "n_samples": len(df),
-                "n_features": len(df.columns),
+                "n_samples": n_samples,
+                "n_features": n_features,
                 "train_size": len(X_train),
                 "val_size": len(X_val),
                 "test_size": len(X_test),
@@ -194,10 +285,10 @@ class KaggleService:
             logger.error("Failed to preprocess dataset", error=str(e))
             raise
     
-    def _generate_eda_stats(self, df: pd.DataFrame, target: pd.Series) -> Dict[str, Any]:
-        """Generate EDA statistics for visualization"""
-        
-        numerical_cols = df.select_dtypes(include=[np.number]).columns[:10]  # Top 10
+    def _generate_eda_stats(self, df_slice: pd.DataFrame, target: pd.Series) -> Dict[str, Any]:
+        """Generate EDA statistics for visualization (from the EDA column subset)"""
+        df = df_slice
+        numerical_cols = df.select_dtypes(include=[np.number]).columns[:EDA_MAX_COLUMNS]
         
         stats = {
             "missing_values": {},
@@ -206,17 +297,21 @@ class KaggleService:
             "feature_stats": {}
         }
         
-        # Get distributions for key features
+        # Get distributions for key features (moments and quartiles for all
+        # columns in two vectorized passes)
+        moments = df[numerical_cols].agg(['mean', 'std', 'min', 'max']).T
+        quartiles = df[numerical_cols].quantile([0.25, 0.5, 0.75]).T
         for col in numerical_cols:
+            row = moments.loc[col]
             stats["distributions"][col] = {
-                "mean": float(df[col].mean()),
-                "std": float(df[col].std()),
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
+                "mean": float(row['mean']),
+                "std": float(row['std']),
+                "min": float(row['min']),
+                "max": float(row['max']),
                 "quartiles": {
-                    "0.25": float(df[col].quantile(0.25)),
-                    "0.5": float(df[col].quantile(0.5)),
-                    "0.75": float(df[col].quantile(0.75))
+                    "0.25": float(quartiles.at[col, 0.25]),
+                    "0.5": float(quartiles.at[col, 0.5]),
+                    "0.75": float(quartiles.at[col, 0.75])
                 }
             }
         
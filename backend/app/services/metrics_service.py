@@ -24,6 +24,7 @@ from sklearn.metrics import (
 import structlog
 
 from app.core.base_service import ModelServiceBase
+from app.core.data_access import canonical_model_id
 
 logger = structlog.get_logger(__name__)
 
@@ -224,7 +225,7 @@ class MetricsService(ModelServiceBase):
         
         try:
             success = self.dal.save_model_metrics(
-                model_id,
+                canonical_model_id(model_id),
                 metrics,
                 source_module=self.service_name
             )
@@ -250,7 +251,7 @@ class MetricsService(ModelServiceBase):
         self._log_operation("get_metrics", model_id=model_id)
         
         try:
-            metrics = self.dal.get_model_metrics(model_id)
+            metrics = self.dal.get_model_metrics(canonical_model_id(model_id))
             
             if metrics:
                 self._log_operation("get_metrics_success", model_id=model_id)
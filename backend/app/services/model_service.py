@@ -5,23 +5,15 @@ Model training service - synchronous training without Celery.
 import os
 import time
 import uuid
-import pickle
 from pathlib import Path
 from typing import Dict, Any
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
-    roc_curve, confusion_matrix, precision_recall_curve
-)
+from importlib.util import find_spec
 import structlog
 
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
+# Checked without importing; xgboost and sklearn load on first training run
+XGBOOST_AVAILABLE = find_spec("xgboost") is not None
 
 from app.core.config import settings
 from app.services.r2_service import r2_service
@@ -146,6 +138,10 @@ class ModelTrainingService:
                 
                 # 7. Evaluate on test set
                 logger.info("Evaluating model on test set")
+                from sklearn.metrics import (
+                    accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
+                    roc_curve, confusion_matrix, precision_recall_curve
+                )
                 y_pred = model.predict(X_test)
                 y_pred_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, 'predict_proba') else y_pred
                 
@@ -191,10 +187,11 @@ class ModelTrainingService:
                 # 8. Get feature importance
                 feature_importance = self._get_feature_importance(model, X_train.columns)
                 
-                # 9. Save model to temp file
+                # 9. Save model to temp file (uncompressed joblib, so that
+                # loaders can memory-map the numpy arrays inside it)
+                import joblib
                 model_path = temp_dir / f"{model_id}.pkl"
-                with open(model_path, 'wb') as f:
-                    pickle.dump(model, f)
+                joblib.dump(model, model_path, compress=0)
                 
                 # 10. Upload model to R2
                 logger.info("Uploading model to R2", model_id=model_id)
@@ -309,6 +306,7 @@ class ModelTrainingService:
         if model_type == 'xgboost':
             if not XGBOOST_AVAILABLE:
                 raise ValueError("XGBoost is not installed")
+            import xgboost as xgb
             
             params = hyperparameters or {
                 'max_depth': 6,
@@ -333,6 +331,7 @@ class ModelTrainingService:
                 'n_jobs': -1
             }
             
+            from sklearn.ensemble import RandomForestClassifier
             model = RandomForestClassifier(**params)
             model.fit(X_train, y_train)
         
@@ -4,13 +4,24 @@ Cloudflare R2 storage service for persistent dataset storage.
 
 import boto3
 from botocore.client import Config
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import structlog
 from typing import Optional, List
 import os
 
+from app.utils.r2_storage import (
+    MAX_POOL_CONNECTIONS,
+    MULTIPART_MAX_CONCURRENCY,
+    TRANSFER_CONFIG,
+)
+
 logger = structlog.get_logger()
 
+# Files transferred at once by upload_directory; each may have
+# MULTIPART_MAX_CONCURRENCY parts in flight, which together fill the pool
+DIRECTORY_UPLOAD_WORKERS = MAX_POOL_CONNECTIONS // MULTIPART_MAX_CONCURRENCY
+
 
 class R2Service:
     """Service for Cloudflare R2 object storage operations"""
@@ -33,7 +44,7 @@ class R2Service:
             endpoint_url=f'https://{self.account_id}.r2.cloudflarestorage.com',
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
-            config=Config(signature_version='s3v4'),
+            config=Config(signature_version='s3v4', max_pool_connections=MAX_POOL_CONNECTIONS),
             region_name='auto'
         )
         
@@ -63,12 +74,12 @@ class R2Service:
         try:
             logger.info("Uploading to R2", local_path=str(local_path), r2_key=r2_key)
             
-            with open(local_path, 'rb') as f:
-                self.client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=r2_key,
-                    Body=f
-                )
+            self.client.upload_file(
+                Filename=str(local_path),
+                Bucket=self.bucket_name,
+                Key=r2_key,
+                Config=TRANSFER_CONFIG
+            )
             
             logger.info("Upload successful", r2_key=r2_key)
             return True
@@ -104,7 +115,8 @@ class R2Service:
             self.client.download_file(
                 Bucket=self.bucket_name,
                 Key=r2_key,
-                Filename=str(local_path)
+                Filename=str(local_path),
+                Config=TRANSFER_CONFIG
             )
             
             logger.info("Download successful", r2_key=r2_key)
@@ -126,13 +138,17 @@ class R2Service:
         try:
             logger.info("Uploading directory to R2", local_dir=str(local_dir), r2_prefix=r2_prefix)
             
-            uploaded_count = 0
-            # Upload both CSV and Parquet files
-            for file_path in local_dir.glob("*"):
-                if file_path.is_file() and file_path.suffix in ['.csv', '.parquet']:
-                    r2_key = f"{r2_prefix}/{file_path.name}"
-                    if self.upload_file(file_path, r2_key):
-                        uploaded_count += 1
+            # Upload both CSV and Parquet files, several files at once
+            file_paths = [
+                file_path for file_path in local_dir.glob("*")
+                if file_path.is_file() and file_path.suffix in ['.csv', '.parquet']
+            ]
+            with ThreadPoolExecutor(max_workers=DIRECTORY_UPLOAD_WORKERS) as executor:
+                results = list(executor.map(
+                    lambda file_path: self.upload_file(file_path, f"{r2_prefix}/{file_path.name}"),
+                    file_paths
+                ))
+            uploaded_count = sum(results)
             
             logger.info("Directory upload complete", uploaded_count=uploaded_count)
             return uploaded_count > 0
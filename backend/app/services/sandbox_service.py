@@ -5,9 +5,6 @@ Provides sample instances and explanations for the Explainability Sandbox.
 
 import numpy as np
 import pandas as pd
-import shap
-import lime
-import lime.lime_tabular
 import joblib
 import random
 import structlog
@@ -209,6 +206,7 @@ class SandboxService:
             prediction_proba = loaded_model.predict_proba([sample.values])[0][1]
             
             # Generate SHAP explanation
+            import shap
             explainer = shap.TreeExplainer(loaded_model)
             shap_values = explainer.shap_values(sample.values.reshape(1, -1))
             
@@ -304,6 +302,7 @@ class SandboxService:
             prediction_proba = loaded_model.predict_proba([sample.values])[0][1]
             
             # Generate LIME explanation
+            import lime.lime_tabular
             explainer = lime.lime_tabular.LimeTabularExplainer(
                 X_test.values,
                 feature_names=X_test.columns.tolist(),
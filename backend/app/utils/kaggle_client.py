@@ -2,6 +2,8 @@
 Kaggle API client for downloading IEEE-CIS fraud detection dataset.
 """
 
+import functools
+import importlib
 import os
 import zipfile
 from pathlib import Path
@@ -11,6 +13,28 @@ import structlog
 logger = structlog.get_logger()
 
 
+@functools.cache
+def _kaggle_api_class():
+    """Import the KaggleApi class on first use (the kaggle package is slow to import)."""
+    return importlib.import_module('kaggle.api.kaggle_api_extended').KaggleApi
+
+
+@functools.lru_cache(maxsize=1)
+def get_kaggle_api():
+    """
+    Get a process-wide authenticated KaggleApi instance.
+    
+    Authentication reads the credentials once; later calls reuse the same
+    client. Failures are not cached, so a retry re-authenticates.
+    
+    Raises:
+        ImportError: If the kaggle package is not installed
+    """
+    api = _kaggle_api_class()()
+    api.authenticate()
+    return api
+
+
 class KaggleClient:
     """
     Client for interacting with Kaggle API to download datasets.
@@ -65,16 +89,12 @@ class KaggleClient:
             Dictionary with download status and file paths
         """
         try:
-            # Import kaggle API
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
             logger.info("Downloading IEEE-CIS dataset from Kaggle",
                        competition=competition_name,
                        output_dir=output_dir)
             
             # Initialize API
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Create output directory
             os.makedirs(output_dir, exist_ok=True)
@@ -141,10 +161,7 @@ class KaggleClient:
             Dictionary with file information
         """
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             files = api.competition_list_files(competition_name)
             
@@ -190,15 +207,12 @@ class KaggleClient:
             Dictionary with download status and file paths
         """
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
             logger.info("Downloading Kaggle competition",
                        competition=competition_name,
                        output_dir=output_dir)
             
             # Initialize API
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Create output directory
             os.makedirs(output_dir, exist_ok=True)
@@ -254,15 +268,12 @@ class KaggleClient:
             Dictionary with download status and file paths
         """
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
             logger.info("Downloading Kaggle dataset",
                        dataset=dataset_name,
                        output_dir=output_dir)
             
             # Initialize API
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Create output directory
             os.makedirs(output_dir, exist_ok=True)
@@ -303,10 +314,7 @@ class KaggleClient:
             True if credentials are valid, False otherwise
         """
         try:
-            from kaggle.api.kaggle_api_extended import KaggleApi
-            
-            api = KaggleApi()
-            api.authenticate()
+            api = get_kaggle_api()
             
             # Try to list competitions to verify authentication
             api.competitions_list(page=1)
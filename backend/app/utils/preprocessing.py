@@ -140,19 +140,22 @@ class DataPreprocessor:
         if 'isFraud' in numerical_cols:
             numerical_cols.remove('isFraud')
         
+        # One null-presence reduction for the whole frame instead of an
+        # isnull().any() scan per column
+        null_mask = df.isna().any()
+        numerical_cols = [col for col in numerical_cols if null_mask[col]]
+        categorical_cols = [col for col in categorical_cols if null_mask[col]]
+        
         # Fill numerical columns with median
-        for col in numerical_cols:
-            if df[col].isnull().any():
-                df[col].fillna(df[col].median(), inplace=True)
+        fill_values = df[numerical_cols].median().to_dict() if numerical_cols else {}
         
         # Fill categorical columns with mode or 'missing'
         for col in categorical_cols:
-            if df[col].isnull().any():
-                mode_val = df[col].mode()
-                if len(mode_val) > 0:
-                    df[col].fillna(mode_val[0], inplace=True)
-                else:
-                    df[col].fillna('missing', inplace=True)
+            mode_val = df[col].mode()
+            fill_values[col] = mode_val[0] if len(mode_val) > 0 else 'missing'
+        
+        if fill_values:
+            df = df.fillna(fill_values)
         
         logger.info("Missing values handled")
         
@@ -8,12 +8,14 @@ import structlog
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
     from botocore.client import Config
     from botocore.exceptions import ClientError
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
     boto3 = None
+    TransferConfig = None
     Config = None
     ClientError = Exception
 
@@ -21,6 +23,22 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+# Multipart transfers: files above 8 MiB move as 8 MiB parts, up to 8 parts
+# in flight per file
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+MULTIPART_MAX_CONCURRENCY = 8
+
+# Enough pooled connections for a few concurrent multipart transfers
+MAX_POOL_CONNECTIONS = 32
+
+# Shared by every R2 client in the backend (see also app.services.r2_service)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=MULTIPART_MAX_CONCURRENCY,
+    use_threads=True
+) if TransferConfig is not None else None
+
 
 class R2StorageClient:
     """
@@ -48,10 +66,11 @@ class R2StorageClient:
                 endpoint_url=settings.R2_ENDPOINT_URL,
                 aws_access_key_id=settings.R2_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                config=Config(signature_version='s3v4'),
+                config=Config(signature_version='s3v4', max_pool_connections=MAX_POOL_CONNECTIONS),
                 region_name='auto'  # R2 uses 'auto' for region
             )
             self.bucket = settings.R2_BUCKET_NAME
+            self.transfer_config = TRANSFER_CONFIG
             logger.info("R2 storage client initialized", 
                        bucket=self.bucket,
                        endpoint=settings.R2_ENDPOINT_URL)
@@ -97,7 +116,8 @@ class R2StorageClient:
                 local_path,
                 self.bucket,
                 remote_path,
-                ExtraArgs=extra_args if extra_args else None
+                ExtraArgs=extra_args if extra_args else None,
+                Config=self.transfer_config
             )
             
             logger.info("File uploaded to R2",
@@ -118,6 +138,53 @@ class R2StorageClient:
                         exc_info=e)
             return False
     
+    def upload_bytes(
+        self,
+        data: bytes,
+        remote_path: str,
+        content_type: Optional[str] = None
+    ) -> bool:
+        """
+        Upload an in-memory payload to R2.
+        
+        Args:
+            data: Object contents
+            remote_path: Remote path in R2 bucket
+            content_type: MIME type (optional)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_available():
+            logger.warning("R2 not available, skipping upload", remote_path=remote_path)
+            return False
+        
+        try:
+            extra_args = {'ContentType': content_type} if content_type else {}
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=remote_path,
+                Body=data,
+                **extra_args
+            )
+            
+            logger.info("Bytes uploaded to R2",
+                       remote_path=remote_path,
+                       size=len(data),
+                       bucket=self.bucket)
+            return True
+        
+        except ClientError as e:
+            logger.error("Failed to upload bytes to R2",
+                        remote_path=remote_path,
+                        error=str(e))
+            return False
+        except Exception as e:
+            logger.error("Unexpected error uploading bytes to R2",
+                        remote_path=remote_path,
+                        exc_info=e)
+            return False
+    
     def download_file(
         self,
         remote_path: str,
@@ -144,7 +211,8 @@ class R2StorageClient:
             self.client.download_file(
                 self.bucket,
                 remote_path,
-                local_path
+                local_path,
+                Config=self.transfer_config
             )
             
             logger.info("File downloaded from R2",
@@ -2,7 +2,7 @@
 Supabase client for database operations.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable
 import structlog
 from datetime import datetime
 
@@ -17,6 +17,20 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+# Narrow column set for callers that only need to identify/describe a model.
+# Excludes heavy JSONB columns (hyperparameters, feature_importance, ...).
+MODEL_SUMMARY_FIELDS = ('id', 'name', 'model_type', 'status', 'dataset_id', 'created_at')
+
+
+def _select_clause(fields: Optional[Iterable[str]]) -> str:
+    """Build a PostgREST select string; None selects every column."""
+    if fields is None:
+        return '*'
+    fields = list(fields)
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return ','.join(fields)
+
 
 class SupabaseClient:
     """Supabase client for database operations."""
@@ -119,8 +133,13 @@ class SupabaseClient:
             logger.error("Failed to create model", error=str(e))
             return None
     
-    def get_model(self, model_id: str) -> Optional[Dict]:
-        """Get model by model_id or id."""
+    def get_model(self, model_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict]:
+        """Get model by model_id or id.
+        
+        Args:
+            model_id: Model identifier (with or without _metrics suffix)
+            fields: Columns to return (defaults to all columns)
+        """
         if not self.is_available():
             return None
         
@@ -129,37 +148,52 @@ class SupabaseClient:
             # But URLs may use either format:
             # - german-credit_xgboost_8d10e541 (without suffix)
             # - german-credit_xgboost_8d10e541_metrics (with suffix)
+            search_id = model_id.replace('_metrics', '')
+            candidate_ids = list(dict.fromkeys([search_id, f"{search_id}_metrics", model_id]))
             
-            result = self.client.table('models').select('*').execute()
+            result = (
+                self.client.table('models')
+                .select(_select_clause(fields))
+                .in_('id', candidate_ids)
+                .execute()
+            )
             
             if result.data:
-                # Remove _metrics suffix if present for comparison
-                search_id = model_id.replace('_metrics', '')
-                
-                # Filter in Python to find matching model
-                for model in result.data:
-                    model_db_id = model.get('id', '')
-                    # Remove _metrics suffix from DB id for comparison
-                    model_db_id_clean = model_db_id.replace('_metrics', '')
-                    
-                    # Match if the clean IDs are the same
-                    if model_db_id_clean == search_id or model_db_id == model_id:
-                        return model
+                # Prefer the exact ID, then the suffix-less form
+                by_id = {model['id']: model for model in result.data}
+                for candidate in (model_id, search_id, f"{search_id}_metrics"):
+                    if candidate in by_id:
+                        return by_id[candidate]
             
             return None
         except Exception as e:
             logger.error("Failed to get model", model_id=model_id, error=str(e))
             return None
     
-    def list_models(self, dataset_id: Optional[str] = None) -> List[Dict]:
-        """List models, optionally filtered by dataset."""
+    def list_models(
+        self,
+        dataset_id: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """List models, optionally filtered by dataset.
+        
+        Args:
+            dataset_id: Filter by dataset
+            fields: Columns to return (defaults to all columns)
+            offset: Index of the first row to return (used with limit)
+            limit: Maximum number of rows to return (None for all)
+        """
         if not self.is_available():
             return []
         
         try:
-            query = self.client.table('models').select('*')
+            query = self.client.table('models').select(_select_clause(fields))
             if dataset_id:
                 query = query.eq('dataset_id', dataset_id)
+            if limit is not None:
+                query = query.range(offset, offset + limit - 1)
             result = query.execute()
             return result.data if result.data else []
         except Exception as e:
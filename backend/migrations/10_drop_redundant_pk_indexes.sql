@@ -0,0 +1,33 @@
+-- ============================================================================
+-- DROP REDUNDANT PRIMARY-KEY INDEXES
+-- ============================================================================
+-- The SQLAlchemy models used to declare their primary keys with index=True,
+-- so metadata.create_all built an ix_<table>_id btree next to the index that
+-- backs the primary key itself; every insert maintained both. The models no
+-- longer declare them; this drops the existing copies.
+--
+-- Only databases created from the SQLAlchemy models have these indexes (the
+-- Supabase schema never created them), so every statement is IF EXISTS and
+-- the file is a no-op elsewhere. The leading-column indexes replaced by the
+-- composite indexes are dropped in 7_composite_lookup_indexes.sql.
+--
+-- DROP INDEX CONCURRENTLY cannot run inside a transaction block: run this
+-- file with psql (autocommit), not as a single SQL Editor transaction.
+--
+-- Run this on your existing database (after 9_explanation_canonical_key.sql)
+-- ============================================================================
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_users_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_datasets_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_models_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_model_metrics_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_explanations_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_explanation_metrics_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_study_sessions_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_study_interactions_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_sandbox_instances_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_explanation_ratings_id;
+
+-- Verification (should return no rows)
+-- SELECT indexname FROM pg_indexes
+-- WHERE indexname IN ('ix_users_id', 'ix_datasets_id', 'ix_models_id', 'ix_explanations_id');
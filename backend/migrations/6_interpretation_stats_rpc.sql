@@ -0,0 +1,30 @@
+-- ============================================================================
+-- INTERPRETATION STATS RPC
+-- ============================================================================
+-- Server-side aggregate for DataAccessLayer.get_interpretation_stats().
+-- Returns the per-mode summary rows and the overall rating count as a single
+-- JSON object, so the API makes one round-trip and does no client-side sum.
+--
+-- A function is used rather than a materialized view: the summary has one
+-- row per mode, and refreshing a materialized view on every feedback insert
+-- would cost more than aggregating on read.
+--
+-- Run this on your existing Supabase database (after 4_interpretation_feedback.sql)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION get_interpretation_stats()
+RETURNS JSONB
+LANGUAGE SQL
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'summary', COALESCE(jsonb_agg(to_jsonb(s)), '[]'::jsonb),
+        'total_ratings', COALESCE(SUM(s.total_ratings), 0)
+    )
+    FROM interpretation_feedback_summary s;
+$$;
+
+COMMENT ON FUNCTION get_interpretation_stats() IS 'Interpretation feedback summary plus total rating count in one call';
+
+-- Verification
+-- SELECT get_interpretation_stats();
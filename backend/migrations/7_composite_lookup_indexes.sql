@@ -0,0 +1,58 @@
+-- ============================================================================
+-- COMPOSITE LOOKUP INDEXES
+-- ============================================================================
+-- Mirrors the composite indexes declared on the SQLAlchemy models:
+--   * explanations: ix_expl_lookup (model_id, method, is_global, instance_id)
+--     serves the explanation cache lookup as a single index seek; its
+--     model_id prefix also serves per-model queries
+--   * study_interactions: ix_interaction_session_created (session_id,
+--     created_at) returns a session's interactions in order
+-- The single-column indexes these lead with are dropped.
+--
+-- CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block: run
+-- this file with psql (autocommit), not as a single SQL Editor transaction.
+--
+-- Run this on your existing Supabase database (after 6_interpretation_stats_rpc.sql)
+-- ============================================================================
+
+-- Explanation scope columns (tables created from the SQLAlchemy models
+-- already have them). Existing rows are classified from explanation_type.
+ALTER TABLE explanations
+ADD COLUMN IF NOT EXISTS is_global BOOLEAN NOT NULL DEFAULT FALSE,
+ADD COLUMN IF NOT EXISTS instance_id VARCHAR(255);
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'explanations' AND column_name = 'explanation_type'
+    ) THEN
+        UPDATE explanations SET is_global = TRUE
+        WHERE explanation_type IS DISTINCT FROM 'local' AND NOT is_global;
+    END IF;
+END $$;
+
+COMMENT ON COLUMN explanations.is_global IS 'TRUE for model-level explanations, FALSE for instance-level ones';
+COMMENT ON COLUMN explanations.instance_id IS 'Explained instance for local explanations (NULL for global)';
+
+-- Explanation cache lookup
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_expl_lookup
+    ON explanations(model_id, method, is_global, instance_id);
+
+-- Led by ix_expl_lookup (Supabase name, then SQLAlchemy name)
+DROP INDEX CONCURRENTLY IF EXISTS idx_explanations_model;
+DROP INDEX CONCURRENTLY IF EXISTS ix_explanations_model_id;
+
+-- Study interactions exist only in databases created from the SQLAlchemy
+-- models; the table is small, so a plain (locking) build is fine there
+DO $$
+BEGIN
+    IF to_regclass('study_interactions') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS ix_interaction_session_created
+            ON study_interactions(session_id, created_at);
+        DROP INDEX IF EXISTS ix_study_interactions_session_id;
+    END IF;
+END $$;
+
+-- Verification
+-- SELECT indexname, indexdef FROM pg_indexes WHERE tablename IN ('explanations', 'study_interactions');
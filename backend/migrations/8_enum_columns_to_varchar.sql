@@ -0,0 +1,116 @@
+-- ============================================================================
+-- STATUS / ROLE / METHOD COLUMNS AS VARCHAR(16) + CHECK
+-- ============================================================================
+-- Mirrors the SQLAlchemy models, which store these columns as String(16)
+-- with a named CHECK constraint instead of a native Postgres enum type:
+--   * datasets.status      ck_dataset_status
+--   * models.status        ck_model_status
+--   * users.role           ck_user_role
+--   * explanations.method  ck_explanation_method
+--
+-- Columns that are still native enums (databases created from the
+-- SQLAlchemy models before this change stored the upper-case member names)
+-- are converted with lower(), which maps each name to its value; VARCHAR
+-- columns are only shortened. The enum types are dropped afterwards.
+--
+-- Constraints are added NOT VALID and validated separately, so the
+-- validation scan does not block writes. If VALIDATE fails, fix the listed
+-- rows and re-run it.
+--
+-- Run this on your existing Supabase database (after 7_composite_lookup_indexes.sql)
+-- ============================================================================
+
+BEGIN;
+
+-- Views over models.status must be recreated around the type change
+DROP VIEW IF EXISTS model_leaderboard;
+DROP VIEW IF EXISTS dataset_statistics;
+
+ALTER TABLE datasets ALTER COLUMN status DROP DEFAULT;
+ALTER TABLE datasets ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text);
+ALTER TABLE datasets ALTER COLUMN status SET DEFAULT 'pending';
+
+ALTER TABLE models ALTER COLUMN status DROP DEFAULT;
+ALTER TABLE models ALTER COLUMN status TYPE VARCHAR(16) USING lower(status::text);
+ALTER TABLE models ALTER COLUMN status SET DEFAULT 'pending';
+
+ALTER TABLE users ALTER COLUMN role DROP DEFAULT;
+ALTER TABLE users ALTER COLUMN role TYPE VARCHAR(16) USING lower(role::text);
+ALTER TABLE users ALTER COLUMN role SET DEFAULT 'researcher';
+
+ALTER TABLE explanations ALTER COLUMN method TYPE VARCHAR(16) USING lower(method::text);
+
+DROP TYPE IF EXISTS datasetstatus;
+DROP TYPE IF EXISTS modelstatus;
+DROP TYPE IF EXISTS userrole;
+DROP TYPE IF EXISTS explanationmethod;
+
+-- Model Leaderboard
+CREATE VIEW model_leaderboard AS
+SELECT 
+    m.id,
+    m.name,
+    m.model_type,
+    m.dataset_id,
+    mm.auc_roc,
+    mm.auc_pr,
+    mm.f1_score,
+    mm.accuracy,
+    mm.precision,
+    mm.recall,
+    m.training_time_seconds,
+    m.model_size_mb,
+    m.created_at,
+    RANK() OVER (PARTITION BY m.dataset_id ORDER BY mm.auc_roc DESC NULLS LAST) as rank_in_dataset,
+    RANK() OVER (ORDER BY mm.auc_roc DESC NULLS LAST) as global_rank
+FROM models m
+LEFT JOIN model_metrics mm ON m.id = mm.model_id
+WHERE m.status = 'completed'
+ORDER BY mm.auc_roc DESC NULLS LAST;
+
+-- Dataset Statistics
+CREATE VIEW dataset_statistics AS
+SELECT 
+    d.id,
+    d.name,
+    d.total_rows,
+    d.total_columns,
+    d.fraud_count,
+    d.non_fraud_count,
+    d.fraud_percentage,
+    COUNT(DISTINCT m.id) as num_models,
+    COUNT(DISTINCT e.id) as num_explanations,
+    MAX(mm.auc_roc) as best_auc_roc,
+    AVG(m.training_time_seconds) as avg_training_time
+FROM datasets d
+LEFT JOIN models m ON d.id = m.dataset_id AND m.status = 'completed'
+LEFT JOIN model_metrics mm ON m.id = mm.model_id
+LEFT JOIN explanations e ON d.id = e.dataset_id
+GROUP BY d.id, d.name, d.total_rows, d.total_columns, d.fraud_count, d.non_fraud_count, d.fraud_percentage;
+
+-- Allowed values (kept in sync with the enums in app/models/)
+ALTER TABLE datasets DROP CONSTRAINT IF EXISTS ck_dataset_status;
+ALTER TABLE datasets ADD CONSTRAINT ck_dataset_status
+    CHECK (status IN ('pending', 'downloading', 'processing', 'completed', 'failed')) NOT VALID;
+
+ALTER TABLE models DROP CONSTRAINT IF EXISTS ck_model_status;
+ALTER TABLE models ADD CONSTRAINT ck_model_status
+    CHECK (status IN ('pending', 'training', 'completed', 'failed')) NOT VALID;
+
+ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_user_role;
+ALTER TABLE users ADD CONSTRAINT ck_user_role
+    CHECK (role IN ('admin', 'researcher')) NOT VALID;
+
+ALTER TABLE explanations DROP CONSTRAINT IF EXISTS ck_explanation_method;
+ALTER TABLE explanations ADD CONSTRAINT ck_explanation_method
+    CHECK (method IN ('shap', 'shap_tree', 'shap_kernel', 'lime')) NOT VALID;
+
+COMMIT;
+
+ALTER TABLE datasets VALIDATE CONSTRAINT ck_dataset_status;
+ALTER TABLE models VALIDATE CONSTRAINT ck_model_status;
+ALTER TABLE users VALIDATE CONSTRAINT ck_user_role;
+ALTER TABLE explanations VALIDATE CONSTRAINT ck_explanation_method;
+
+-- Verification
+-- SELECT conrelid::regclass, conname, convalidated FROM pg_constraint WHERE conname LIKE 'ck_%';
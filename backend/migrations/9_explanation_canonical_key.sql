@@ -0,0 +1,57 @@
+-- ============================================================================
+-- EXPLANATION CANONICAL KEY
+-- ============================================================================
+-- Makes (model_id, method, is_global, instance_id) unique on explanations
+-- (constraint uq_expl_canonical, as on the SQLAlchemy model). The DAL saves
+-- explanations with an upsert on this key
+-- (ON CONFLICT (model_id, method, is_global, instance_id) DO UPDATE), so
+-- re-running an explanation replaces the model's row instead of adding one.
+-- NULLS NOT DISTINCT (Postgres 15+) makes global explanations, whose
+-- instance_id is NULL, collide as intended.
+--
+-- Existing duplicates are removed first, keeping the newest completed row of
+-- each key (the newest row if none completed). Stop explanation writes while
+-- this runs: a duplicate inserted between the DELETE and the index build
+-- leaves the index INVALID (drop it and re-run the file).
+--
+-- CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block: run
+-- this file with psql (autocommit), not as a single SQL Editor transaction.
+--
+-- Run this on your existing Supabase database (after 8_enum_columns_to_varchar.sql)
+-- ============================================================================
+
+-- Remove duplicates of the canonical key
+DELETE FROM explanations e
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY model_id, method, is_global, instance_id
+               ORDER BY (status = 'completed') DESC NULLS LAST,
+                        created_at DESC NULLS LAST,
+                        id DESC
+           ) AS rn
+    FROM explanations
+) ranked
+WHERE e.id = ranked.id AND ranked.rn > 1;
+
+-- Build the unique index without blocking writes, then attach it as the
+-- constraint
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_expl_canonical
+    ON explanations(model_id, method, is_global, instance_id) NULLS NOT DISTINCT;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_expl_canonical') THEN
+        ALTER TABLE explanations ADD CONSTRAINT uq_expl_canonical UNIQUE USING INDEX uq_expl_canonical;
+    END IF;
+END $$;
+
+-- Same columns as the constraint's index
+DROP INDEX CONCURRENTLY IF EXISTS ix_expl_lookup;
+
+-- cache_key is no longer unique (SQLAlchemy-created databases only)
+DROP INDEX CONCURRENTLY IF EXISTS ix_explanations_cache_key;
+
+-- Verification
+-- SELECT model_id, method, is_global, instance_id, COUNT(*)
+-- FROM explanations GROUP BY 1, 2, 3, 4 HAVING COUNT(*) > 1;
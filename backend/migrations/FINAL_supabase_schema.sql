@@ -25,11 +25,12 @@ CREATE TABLE users (
     email VARCHAR(255) UNIQUE NOT NULL,
     password_hash VARCHAR(255) NOT NULL,
     full_name VARCHAR(255),
-    role VARCHAR(50) DEFAULT 'researcher',
+    role VARCHAR(16) DEFAULT 'researcher',
     is_active BOOLEAN DEFAULT true,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
-    last_login TIMESTAMPTZ
+    last_login TIMESTAMPTZ,
+    CONSTRAINT ck_user_role CHECK (role IN ('admin', 'researcher'))
 );
 
 -- Datasets
@@ -39,7 +40,8 @@ CREATE TABLE datasets (
     description TEXT,
     source VARCHAR(255) NOT NULL,
     source_identifier VARCHAR(255),
-    status VARCHAR(50) DEFAULT 'pending',
+    status VARCHAR(16) DEFAULT 'pending' CONSTRAINT ck_dataset_status
+        CHECK (status IN ('pending', 'downloading', 'processing', 'completed', 'failed')),
     file_path VARCHAR(500),
     file_size_mb FLOAT,
     total_rows INTEGER,
@@ -69,7 +71,8 @@ CREATE TABLE models (
     model_type VARCHAR(50) NOT NULL,
     version VARCHAR(50) NOT NULL,
     dataset_id VARCHAR(255) REFERENCES datasets(id) ON DELETE CASCADE,
-    status VARCHAR(50) DEFAULT 'pending',
+    status VARCHAR(16) DEFAULT 'pending' CONSTRAINT ck_model_status
+        CHECK (status IN ('pending', 'training', 'completed', 'failed')),
     hyperparameters JSONB,
     training_config JSONB,
     feature_importance JSONB,
@@ -116,8 +119,11 @@ CREATE TABLE explanations (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     model_id VARCHAR(255) REFERENCES models(id) ON DELETE CASCADE,
     dataset_id VARCHAR(255) REFERENCES datasets(id) ON DELETE CASCADE,
-    method VARCHAR(50) NOT NULL,
+    method VARCHAR(16) NOT NULL CONSTRAINT ck_explanation_method
+        CHECK (method IN ('shap', 'shap_tree', 'shap_kernel', 'lime')),
     explanation_type VARCHAR(50) DEFAULT 'global',
+    is_global BOOLEAN NOT NULL DEFAULT FALSE,
+    instance_id VARCHAR(255),
     explanation_data JSONB,
     summary_json JSONB,
     top_features JSONB,
@@ -132,7 +138,9 @@ CREATE TABLE explanations (
     completed_at TIMESTAMPTZ,
     -- DAL metadata columns
     last_updated TIMESTAMPTZ DEFAULT NOW(),
-    source_module VARCHAR(100)
+    source_module VARCHAR(100),
+    -- Canonical key: explanations are saved with an upsert on it
+    CONSTRAINT uq_expl_canonical UNIQUE NULLS NOT DISTINCT (model_id, method, is_global, instance_id)
 );
 
 -- ============================================================================
@@ -280,7 +288,6 @@ CREATE INDEX idx_model_metrics_auc_roc ON model_metrics(auc_roc DESC);
 CREATE INDEX idx_model_metrics_last_updated ON model_metrics(last_updated DESC);
 
 -- Explanations
-CREATE INDEX idx_explanations_model ON explanations(model_id);
 CREATE INDEX idx_explanations_dataset ON explanations(dataset_id);
 CREATE INDEX idx_explanations_method ON explanations(method);
 CREATE INDEX idx_explanations_type ON explanations(explanation_type);
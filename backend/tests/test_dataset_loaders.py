@@ -0,0 +1,154 @@
+"""
+Dataset Loader Cache Tests
+==========================
+
+Unit tests for the raw Parquet cache and the preprocessed-frame cache of
+BaseDatasetLoader, using a minimal CSV loader in a temporary directory.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.core.config import settings
+from app.datasets.loaders.base import BaseDatasetLoader
+
+
+class _CsvLoader(BaseDatasetLoader):
+    """Loader over a single data.csv that counts source reads and preprocessing runs."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.source_reads = 0
+        self.preprocess_calls = 0
+
+    async def download(self) -> Path:
+        return self.data_dir
+
+    def load_raw_data(self) -> pd.DataFrame:
+        return self.load_cached_raw(self._read_source)
+
+    def _read_source(self) -> pd.DataFrame:
+        self.source_reads += 1
+        return pd.read_csv(self.data_dir / "data.csv")
+
+    def preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.preprocess_calls += 1
+        return df.assign(x2=df["x"] * 2)
+
+
+def _write_csv(data_dir: Path, values) -> None:
+    pd.DataFrame({"x": values, "target": [0, 1] * (len(values) // 2)}).to_csv(
+        data_dir / "data.csv", index=False
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "raw"
+    path.mkdir()
+    _write_csv(path, [1, 2, 3, 4])
+    return path
+
+
+@pytest.fixture(autouse=True)
+def preprocess_cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "preprocess_cache"
+    monkeypatch.setattr(settings, "PREPROCESS_CACHE_DIR", str(path))
+    return path
+
+
+def _loader(data_dir: Path, **config) -> _CsvLoader:
+    return _CsvLoader("toy", {"target_column": "target", **config}, data_dir=data_dir)
+
+
+class TestRawParquetCache:
+    """Test load_cached_raw reuse and invalidation."""
+
+    def test_reuses_parquet_while_sources_unchanged(self, data_dir):
+        """Test a second loader reads the Parquet cache instead of the CSV."""
+        first = _loader(data_dir)
+        first.load_raw_data()
+        assert first.source_reads == 1
+        assert (data_dir / "toy.parquet").exists()
+
+        second = _loader(data_dir)
+        df = second.load_raw_data()
+        assert second.source_reads == 0
+        assert df["x"].tolist() == [1, 2, 3, 4]
+
+    def test_rebuilds_parquet_when_csv_changes(self, data_dir):
+        """Test a changed CSV invalidates the Parquet cache."""
+        _loader(data_dir).load_raw_data()
+        _write_csv(data_dir, [10, 20, 30, 40, 50, 60])
+
+        loader = _loader(data_dir)
+        df = loader.load_raw_data()
+        assert loader.source_reads == 1
+        assert df["x"].tolist() == [10, 20, 30, 40, 50, 60]
+
+        # The rebuilt cache is tagged with the new sources and reused
+        again = _loader(data_dir)
+        assert again.load_raw_data()["x"].tolist() == [10, 20, 30, 40, 50, 60]
+        assert again.source_reads == 0
+
+
+class TestPreprocessedCache:
+    """Test load_preprocessed keying on sources and config."""
+
+    def test_cache_lives_under_configured_directory(self, data_dir, preprocess_cache_dir):
+        """Test the preprocessed frame is stored under settings.PREPROCESS_CACHE_DIR."""
+        _loader(data_dir).load_preprocessed()
+        assert list((preprocess_cache_dir / "toy").glob("*.parquet"))
+
+    def test_same_inputs_hit_cache_across_data_directories(self, data_dir, tmp_path):
+        """Test identical sources in another (temporary) directory reuse the cached frame."""
+        first = _loader(data_dir)
+        expected = first.load_preprocessed()
+        assert first.preprocess_calls == 1
+
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        _write_csv(other_dir, [1, 2, 3, 4])
+        second = _loader(other_dir)
+        df = second.load_preprocessed()
+        assert second.preprocess_calls == 0
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_changed_csv_or_config_misses_cache(self, data_dir):
+        """Test new source contents and a different config each recompute."""
+        _loader(data_dir).load_preprocessed()
+
+        reconfigured = _loader(data_dir, split_ratios={"train": 0.8, "val": 0.1, "test": 0.1})
+        reconfigured.load_preprocessed()
+        assert reconfigured.preprocess_calls == 1
+
+        _write_csv(data_dir, [5, 6, 7, 8])
+        changed = _loader(data_dir)
+        df = changed.load_preprocessed()
+        assert changed.preprocess_calls == 1
+        assert df["x2"].tolist() == [10, 12, 14, 16]
+
+    def test_truncated_cache_is_recomputed(self, data_dir, preprocess_cache_dir):
+        """Test a corrupt cached frame is rebuilt and no temporary files are left."""
+        _loader(data_dir).load_preprocessed()
+        [frame_path] = (preprocess_cache_dir / "toy").glob("*.parquet")
+        frame_path.write_bytes(frame_path.read_bytes()[:20])
+
+        loader = _loader(data_dir)
+        df = loader.load_preprocessed()
+        assert loader.preprocess_calls == 1
+        assert df["x2"].tolist() == [2, 4, 6, 8]
+
+        again = _loader(data_dir)
+        again.load_preprocessed()
+        assert again.preprocess_calls == 0
+        assert not list((preprocess_cache_dir / "toy").glob("*.part"))
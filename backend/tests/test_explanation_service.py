@@ -0,0 +1,179 @@
+"""
+Explanation Service Tests
+=========================
+
+Unit tests for SHAP explainer routing and result shaping. R2 is replaced
+by an in-memory stub, so no storage or database access is needed.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("shap")
+pytest.importorskip("pyarrow")
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.services import explanation_service as module
+
+
+class _StubR2:
+    """In-memory stand-in for ``r2_storage_client``."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def file_exists(self, remote_path):
+        return remote_path in self.objects
+
+    def upload_file(self, local_path, remote_path):
+        self.objects[remote_path] = Path(local_path).read_bytes()
+        return True
+
+    def upload_bytes(self, data, remote_path, content_type=None):
+        self.objects[remote_path] = data
+        return True
+
+    def download_file(self, remote_path, local_path):
+        Path(local_path).write_bytes(self.objects[remote_path])
+        return True
+
+
+@pytest.fixture
+def stub_r2(monkeypatch):
+    stub = _StubR2()
+    monkeypatch.setattr(module, "r2_storage_client", stub)
+    monkeypatch.setattr(module, "_gpu_available", lambda: False)
+    monkeypatch.setattr(module.settings, "SHAP_USE_FASTTREESHAP", False, raising=False)
+    return stub
+
+
+@pytest.fixture
+def forest(tmp_path):
+    """Small fitted RandomForestClassifier saved the way ModelService saves it."""
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(60, 4)), columns=["a", "b", "c", "d"]).astype(np.float32)
+    y = (X["a"] + X["b"] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=5, max_depth=3, random_state=0).fit(X, y)
+
+    model_path = tmp_path / "model.pkl"
+    joblib.dump(model, model_path, compress=0)
+    return model_path, X
+
+
+class TestExpectedValue:
+    """Test base value extraction across explainer shapes."""
+
+    def test_scalar_and_per_class_expected_values(self):
+        """Test scalars pass through and per-class arrays give the positive class."""
+        class Explainer:
+            def __init__(self, expected_value):
+                self.expected_value = expected_value
+
+        assert module._expected_value(Explainer(0.25)) == 0.25
+        assert module._expected_value(Explainer(np.array([0.7, 0.3]))) == pytest.approx(0.3)
+        assert module._expected_value(Explainer([0.6, 0.4])) == pytest.approx(0.4)
+        assert module._expected_value(object()) == 0.0
+
+
+class TestGenerateShap:
+    """Test global SHAP generation for sklearn tree ensembles."""
+
+    def test_random_forest_uses_tree_explainer(self, stub_r2, forest, tmp_path):
+        """Test a random forest goes through TreeExplainer and yields a float base value."""
+        import shap
+
+        model_path, X = forest
+        service = module.ExplanationService()
+        model = {'model_type': 'random_forest', 'model_path': 'models/rf/model.pkl'}
+
+        result = service._generate_shap("expl-rf", "rf", model, model_path, X, tmp_path)
+
+        explainer = service._explainer_cache[("rf", "random_forest")]
+        assert isinstance(explainer, shap.TreeExplainer)
+        assert isinstance(result['base_value'], float)
+        assert 0.0 <= result['base_value'] <= 1.0
+        assert set(result['feature_importance']) == set(X.columns)
+        assert result['shap_values_r2_key'] in stub_r2.objects
+
+    def test_gpu_failure_falls_back_to_cpu(self, stub_r2, forest, tmp_path, monkeypatch):
+        """Test a GPUTreeShap error (e.g. shap built without CUDA) uses the CPU explainer."""
+        import shap
+
+        def no_cuda(*args, **kwargs):
+            raise RuntimeError("GPUTreeShap was not compiled")
+
+        model_path, X = forest
+        monkeypatch.setattr(module, "_gpu_available", lambda: True)
+        monkeypatch.setattr(module, "GPU_TREESHAP_MIN_ROWS", 0)
+        monkeypatch.setattr(shap, "GPUTreeExplainer", no_cuda, raising=False)
+        service = module.ExplanationService()
+        model = {'model_type': 'random_forest', 'model_path': 'models/rf/model.pkl'}
+
+        result = service._generate_shap("expl-rf", "rf", model, model_path, X, tmp_path)
+
+        assert isinstance(service._explainer_cache[("rf", "random_forest")], shap.TreeExplainer)
+        assert set(result['feature_importance']) == set(X.columns)
+
+
+class TestExplainerPersistence:
+    """Test explainer reuse through the in-memory cache and R2."""
+
+    def test_explainer_restored_from_r2_without_refit(self, stub_r2, forest, tmp_path, monkeypatch):
+        """Test a fresh service loads the persisted explainer and leaves no scratch files."""
+        model_path, X = forest
+        model = {'model_type': 'random_forest', 'model_path': 'models/rf/model.pkl'}
+        trained_model = module._load_model(model_path)
+
+        module.ExplanationService()._get_explainer("rf", model, trained_model, lambda: X, tmp_path)
+        assert 'models/rf/model.pkl.explainer.pkl' in stub_r2.objects
+
+        def fail_fit(*args, **kwargs):
+            raise AssertionError("explainer was refitted")
+
+        monkeypatch.setattr(module, "_make_shap_explainer", fail_fit)
+        explainer = module.ExplanationService()._get_explainer(
+            "rf", model, trained_model, lambda: X, tmp_path
+        )
+        assert module._expected_value(explainer) > 0.0
+        assert not list(tmp_path.glob("explainer*"))
+
+    def test_concurrent_misses_fit_once(self, stub_r2, forest, tmp_path, monkeypatch):
+        """Test parallel requests for an uncached explainer share a single fit."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        model_path, X = forest
+        model = {'model_type': 'random_forest', 'model_path': 'models/rf/model.pkl'}
+        trained_model = module._load_model(model_path)
+        fit = module._make_shap_explainer
+        fits = []
+
+        def slow_fit(*args, **kwargs):
+            fits.append(threading.get_ident())
+            time.sleep(0.2)
+            return fit(*args, **kwargs)
+
+        monkeypatch.setattr(module, "_make_shap_explainer", slow_fit)
+        service = module.ExplanationService()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            explainers = list(pool.map(
+                lambda _: service._get_explainer("rf", model, trained_model, lambda: X, tmp_path),
+                range(4)
+            ))
+
+        assert len(fits) == 1
+        assert all(explainer is explainers[0] for explainer in explainers)
+        assert list(stub_r2.objects) == ['models/rf/model.pkl.explainer.pkl']
@@ -20,7 +20,7 @@ from pathlib import Path
 backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
 
-from app.core.data_access import dal
+from app.core.data_access import dal, canonical_model_id
 from app.services.metrics_service import metrics_service
 from app.core.config import settings
 
@@ -190,21 +190,46 @@ class TestDALOperations:
             assert 'auc_roc' not in model_no_metrics or model_with_metrics != model_no_metrics
     
     def test_model_id_suffix_handling(self):
-        """Test that _metrics suffix is handled correctly."""
-        models = dal.list_models(include_metrics=False)
+        """Test that the _metrics suffix is stripped before IDs reach the DAL."""
+        assert canonical_model_id("german-credit_xgboost_8d10e541_metrics") == "german-credit_xgboost_8d10e541"
+        assert canonical_model_id("german-credit_xgboost_8d10e541") == "german-credit_xgboost_8d10e541"
         
-        if not models:
-            pytest.skip("No models in database")
+        pytest.importorskip("fastapi")
+        import asyncio
+        from app.api.dependencies import get_model_id
         
-        model_id = models[0]['id']
+        assert asyncio.run(get_model_id("german-credit_xgboost_8d10e541_metrics")) == "german-credit_xgboost_8d10e541"
+    
+    def test_dal_rejects_suffixed_ids_in_debug(self, monkeypatch):
+        """Test the DAL guard flags IDs that skipped route-level normalization."""
+        monkeypatch.setattr(settings, "DEBUG", True)
+        
+        with pytest.raises(AssertionError):
+            dal.get_model_metrics("german-credit_xgboost_8d10e541_metrics")
+    
+    def test_local_explanation_requires_instance_id(self):
+        """Test a local explanation without instance_id is rejected before any write."""
+        with pytest.raises(ValueError):
+            dal.save_explanation(
+                "german-credit_xgboost_8d10e541", "shap", {'status': 'completed'},
+                explanation_type="local"
+            )
+    
+    def test_list_models_enriches_legacy_suffixed_rows(self, monkeypatch):
+        """Test rows whose id carries the legacy suffix still get their metrics."""
+        class StubDB:
+            def list_models(self, **kwargs):
+                return [{'id': 'legacy_xgboost_1_metrics', 'status': 'completed'}]
+            
+            def get_model_metrics(self, model_id):
+                return {'auc_roc': 0.9} if model_id == 'legacy_xgboost_1' else None
+        
+        monkeypatch.setattr(settings, "DEBUG", True)
+        monkeypatch.setattr(dal, "db", StubDB())
         
-        # Both with and without suffix should work
-        model1 = dal.get_model(model_id)
-        model2 = dal.get_model(f"{model_id}_metrics")
+        models = dal.list_models(include_metrics=True)
         
-        assert model1 is not None
-        assert model2 is not None
-        assert model1['id'] == model2['id']
+        assert models == [{'id': 'legacy_xgboost_1_metrics', 'status': 'completed', 'auc_roc': 0.9}]
     
     def test_list_models_filtering(self):
         """Test model listing with filters."""
@@ -250,4 +275,22 @@ class TestEndpointResponses:
         pytest.skip("Requires TestClient - implement in integration tests")
 
 
+class TestExplanationService:
+    """Test explanation service wiring."""
+    
+    def test_singleton_uses_the_caching_service_class(self):
+        """Test the module singleton is built by the __init__ that sets up the explainer cache."""
+        from collections import OrderedDict
+        from app.services import explanation_service as module
+        
+        service = module.explanation_service
+        assert type(service) is module.ExplanationService
+        assert isinstance(service._explainer_cache, OrderedDict)
+        
+        # A fresh instance from the same class gets its own empty cache
+        fresh = type(service)()
+        assert fresh._explainer_cache == OrderedDict()
+        assert fresh._explainer_cache is not service._explainer_cache
+
+
 # Run tests with: pytest backend/tests/test_integrity.py -v
@@ -0,0 +1,159 @@
+"""
+Interpretation Service Tests
+============================
+
+Unit tests for LLM streaming (with a stubbed OpenAI client and cache) and
+for rule-based interpretation, single and batched. No API key or network
+access is needed.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.services.interpretation_service import InterpretationService
+
+
+SHAP_DATA = {
+    'prediction_proba': 0.72,
+    'features': [
+        {'feature': 'EXT_SOURCE_2', 'value': 0.12, 'contribution': 0.41},
+        {'feature': 'AMT_CREDIT', 'value': 450000, 'contribution': 0.18},
+        {'feature': 'DAYS_BIRTH', 'value': -12000, 'contribution': -0.09},
+    ],
+}
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class _StubCompletions:
+    """Records create() calls and replays a fixed chunk stream."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return iter(self.chunks)
+
+
+class _StubCache:
+    """dict-backed stand-in for the diskcache interface used by the service."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+
+def _service(chunks):
+    """Service with the lazy OpenAI client and LLM cache replaced by stubs."""
+    service = InterpretationService()
+    completions = _StubCompletions(chunks)
+    # cached_property values live in the instance dict
+    service.__dict__['openai_client'] = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    service.__dict__['_llm_cache'] = _StubCache()
+    return service, completions
+
+
+class TestInterpretationStream:
+    """Test generate_interpretation_stream."""
+
+    def test_yields_fragments_in_order_and_caches_full_text(self):
+        """Test fragments are streamed as received and the joined text is cached."""
+        chunks = [
+            _chunk("The application "),
+            SimpleNamespace(choices=[]),  # e.g. a usage-only chunk
+            _chunk(None),
+            _chunk("is high risk."),
+        ]
+        service, completions = _service(chunks)
+
+        fragments = list(service.generate_interpretation_stream(SHAP_DATA))
+
+        assert fragments == ["The application ", "is high risk."]
+        assert completions.calls[0]['stream'] is True
+        assert list(service._llm_cache.data.values()) == ["The application is high risk."]
+
+    def test_cached_text_is_yielded_without_calling_the_client(self):
+        """Test a repeated request is served from the cache in one piece."""
+        service, completions = _service([_chunk("Cached "), _chunk("answer.")])
+        list(service.generate_interpretation_stream(SHAP_DATA))
+
+        fragments = list(service.generate_interpretation_stream(SHAP_DATA))
+
+        assert fragments == ["Cached answer."]
+        assert len(completions.calls) == 1
+
+    def test_requires_api_key(self):
+        """Test streaming without a client raises before yielding anything."""
+        service = InterpretationService()
+        service.__dict__['openai_client'] = None
+
+        with pytest.raises(ValueError):
+            next(service.generate_interpretation_stream(SHAP_DATA))
+
+
+class TestBatchInterpret:
+    """Test batch_interpret against the single-applicant rule-based path."""
+
+    FEATURES = ['EXT_SOURCE_2', 'AMT_CREDIT', 'DAYS_BIRTH', 'AMT_ANNUITY', 'FLAG_OWN_CAR', 'CNT_CHILDREN']
+
+    def _shap_data(self, contributions, values, proba):
+        return {
+            'prediction_proba': proba,
+            'prediction': int(proba > 0.5),
+            'features': [
+                {'feature': name, 'value': value, 'contribution': contribution}
+                for name, value, contribution in zip(self.FEATURES, values, contributions)
+            ],
+        }
+
+    def test_matches_generate_interpretation_per_row(self):
+        """Test every batched result equals the single-applicant rule-based result."""
+        rng = np.random.default_rng(0)
+        shap_matrix = rng.normal(scale=0.3, size=(8, len(self.FEATURES)))
+        values = np.round(rng.normal(size=(8, len(self.FEATURES))), 2)
+        probas = rng.uniform(size=8).round(3).tolist()
+        service = InterpretationService()
+
+        batch = service.batch_interpret(shap_matrix, self.FEATURES, probas, feature_values=values)
+
+        assert len(batch) == 8
+        for row, result in enumerate(batch):
+            expected = service.generate_interpretation(
+                self._shap_data(shap_matrix[row].tolist(), values[row].tolist(), probas[row])
+            )
+            assert result == expected
+
+    def test_without_feature_values_and_ties(self):
+        """Test missing values render as N/A and tied magnitudes keep feature order."""
+        shap_matrix = np.array([[0.2, -0.2, 0.05, 0.2, -0.4, 0.0]])
+        service = InterpretationService()
+
+        [result] = service.batch_interpret(shap_matrix, self.FEATURES, [0.3], top_k=3)
+        expected = service.generate_interpretation(
+            self._shap_data(shap_matrix[0].tolist(), ['N/A'] * len(self.FEATURES), 0.3)
+        )
+
+        assert result['top_features'] == ['FLAG_OWN_CAR', 'EXT_SOURCE_2', 'AMT_CREDIT']
+        assert 'N/A' in result['interpretation']
+        # The single path always explains five features; compare the shared ones
+        assert expected['top_features'][:3] == result['top_features']
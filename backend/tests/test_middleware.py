@@ -0,0 +1,62 @@
+"""
+Middleware Tests
+================
+
+Unit tests for the ASGI middleware in app.core.middleware, run against a
+minimal Starlette app.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.middleware import SelectiveGZipMiddleware
+
+
+def _events(request):
+    def body():
+        for i in range(3):
+            yield f"data: {i}\n\n"
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+def _text(request):
+    return PlainTextResponse("x" * 2000)
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/stream", _events), Route("/text", _text)])
+    app.add_middleware(
+        SelectiveGZipMiddleware, minimum_size=100, exclude_paths=frozenset({"/stream"})
+    )
+    return TestClient(app)
+
+
+class TestSelectiveGZipMiddleware:
+    """Test gzip is applied except on excluded paths."""
+
+    def test_regular_response_is_compressed(self, client):
+        """Test bodies above the minimum size are gzip-encoded."""
+        response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.text == "x" * 2000
+
+    def test_event_stream_is_not_compressed(self, client):
+        """Test an excluded SSE route is sent without content encoding."""
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"